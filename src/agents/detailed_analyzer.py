@@ -2,14 +2,98 @@
 Detailed Section-Specific Analyzer
 
 Performs in-depth quantitative analysis for each section.
-This is called AFTER basic comparison to add detailed insights.
+Runs alongside the basic comparison to add detailed insights.
 """
 
-from typing import Dict, Any
-import json
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, List, Optional
+from string import Template
+import asyncio
 from langchain_core.messages import SystemMessage, HumanMessage
+from src.utils import json_utils
 from src.utils.logger import setup_logger
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.llm_client import get_chat_model, get_llm_client
+
+
+SECTION_SYSTEM_PROMPT = """You are an expert property data analyst specializing in quantitative analysis.
+
+Your task: Perform DEEP analysis of ONE standard section, named at the end of the user message.
+
+For the section, provide:
+1. Presence status (✓ Present, ✗ Missing, ⚠ Partial)
+2. Amber metrics (word count, item count, richness score 0-100)
+3. Competitor metrics (word count, item count, richness score 0-100)
+4. Specific items in each (list all)
+5. Gap items (present in one but not other)
+6. Quantitative comparison (which is better and by how much)
+7. Strategic recommendations
+8. Department-specific actions (Content, UX, SEO, Marketing, Product)
+
+OUTPUT FORMAT (key is the section name):
+{
+  "<section_name>": {
+    "amber_present": true/false,
+    "competitor_present": true/false,
+    "status": "both_have" | "amber_only" | "competitor_only" | "neither",
+    "status_icon": "⚖️" | "🏆" | "🚨" | "❌",
+    "amber_metrics": {
+      "word_count": 150,
+      "item_count": 5,
+      "richness_score": 75,
+      "specific_items": ["Item 1", "Item 2"]
+    },
+    "competitor_metrics": {
+      "word_count": 200,
+      "item_count": 7,
+      "richness_score": 85,
+      "specific_items": ["Item A", "Item B"]
+    },
+    "gap_analysis": {
+      "missing_in_amber": ["Item A"],
+      "missing_in_competitor": ["Item 1"]
+    },
+    "quantitative_verdict": "Competitor has 33% more items and 40% more content",
+    "recommendations": [
+      "Add Item A to match competitor",
+      "Enhance word count by 50 words"
+    ],
+    "department_actions": {
+      "content": "Add X, Y, Z",
+      "ux": "Improve layout",
+      "seo": "Add keywords",
+      "marketing": "Highlight feature",
+      "product": "Build feature"
+    }
+  }
+}
+
+If the section is not present in either property, mark it as "neither" and explain the impact."""
+
+# Shared data first and the section name last, so every section call
+# has the same prompt prefix
+SECTION_USER_TEMPLATE = Template("""Perform detailed quantitative analysis on these properties:
+
+AMBER DATA:
+$amber_json
+
+COMPETITOR DATA:
+$competitor_json
+
+${comparison_block}ANALYSIS REQUIREMENTS:
+1. Provide specific item-by-item comparison
+2. Calculate precise metrics (word counts, item counts, scores)
+3. Identify exact gaps (what's missing where)
+4. Give actionable department-specific recommendations
+5. Ensure richness scores are accurate (0-100 scale based on completeness and detail)
+
+SECTION TO ANALYZE: $section
+
+Return JSON with only the "$section" key.""")
+
+
+def _compact_json(data: Any) -> str:
+    """Deterministic compact JSON for embedding in prompts"""
+    return json_utils.dumps(data)
 
 
 class DetailedSectionAnalyzer:
@@ -42,13 +126,26 @@ class DetailedSectionAnalyzer:
         "company_info"
     ]
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        use_batch_api: bool = False,
+        batch_timeout: float = 600.0
+    ):
+        """
+        Args:
+            max_concurrency: Max section LLM calls in flight at once (aanalyze)
+            use_batch_api: Submit section calls as one OpenAI Batch API job
+                (50% cheaper, but completes asynchronously - up to 24h)
+            batch_timeout: Seconds to wait for the batch before falling back to
+                per-section calls (keep below the ARQ job_timeout)
+        """
         self.logger = setup_logger(self.__class__.__name__)
-        self.llm = ChatOpenAI(
-            model="gpt-4o",  # Use full model for detailed analysis
-            temperature=0.1,
-            model_kwargs={"response_format": {"type": "json_object"}}
-        )
+        self.max_concurrency = max_concurrency
+        self.use_batch_api = use_batch_api
+        self.batch_timeout = batch_timeout
+        self.llm = get_chat_model("gpt-4o", temperature=0.1, json_mode=True)  # Use full model for detailed analysis
+        self.batch_client = get_llm_client("openai", "gpt-4o") if use_batch_api else None
     
     def analyze(
         self,
@@ -73,7 +170,7 @@ class DetailedSectionAnalyzer:
                 HumanMessage(content=user_prompt)
             ])
             
-            result = json.loads(response.content)
+            result = json_utils.loads(response.content)
             self.logger.info(f"Detailed analysis complete: {len(result.get('sections', {}))} sections analyzed")
             return result
             
@@ -81,6 +178,164 @@ class DetailedSectionAnalyzer:
             self.logger.error(f"Detailed analysis failed: {e}")
             return self._empty_analysis()
     
+    async def aanalyze(
+        self,
+        amber_data: Dict[str, Any],
+        competitor_data: Dict[str, Any],
+        basic_comparison: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Perform detailed analysis with one LLM call per section, run concurrently
+        
+        Calls are bounded by max_concurrency. A failed section falls back to an
+        empty entry instead of failing the whole analysis.
+        
+        Args:
+            basic_comparison: Optional comparator output used as extra context.
+                Sections only need the extracted data, so the pipeline omits it
+                to run this step alongside the comparator.
+        
+        Returns:
+            Same structure as analyze()
+        """
+        self.logger.info(
+            f"Starting detailed section analysis "
+            f"({len(self.STANDARD_SECTIONS)} sections, concurrency {self.max_concurrency})..."
+        )
+        
+        system_prompt = self._build_section_system_prompt()
+        context = self._section_prompt_context(amber_data, competitor_data, basic_comparison)
+        
+        results = None
+        if self.use_batch_api:
+            try:
+                results = await self._abatch_sections(system_prompt, context)
+            except Exception as e:
+                # Failed, expired, cancelled or past batch_timeout
+                self.logger.error(f"Batch analysis failed, falling back to per-section calls: {e}")
+        
+        if results is None:
+            results = await self._afan_out_sections(system_prompt, context)
+        
+        all_sections = {}
+        for section, result in zip(self.STANDARD_SECTIONS, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Detailed analysis failed for {section}: {result}")
+                all_sections[section] = self._empty_section()
+            else:
+                all_sections[section] = result
+        
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        self.logger.info(
+            f"Detailed analysis complete: {len(all_sections) - failed} sections analyzed, {failed} failed"
+        )
+        
+        return {
+            "all_21_sections": all_sections,
+            "quantitative_summary": self._summarize_sections(all_sections)
+        }
+    
+    async def _afan_out_sections(
+        self,
+        system_prompt: str,
+        context: Dict[str, str]
+    ) -> List[Any]:
+        """
+        Analyze every section with its own call, max_concurrency at a time
+        
+        Returns:
+            Parsed section result or the exception, in STANDARD_SECTIONS order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def analyze_bounded(section: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._aanalyze_section(system_prompt, context, section)
+        
+        return await asyncio.gather(
+            *(analyze_bounded(section) for section in self.STANDARD_SECTIONS),
+            return_exceptions=True
+        )
+    
+    async def _aanalyze_section(
+        self,
+        system_prompt: str,
+        context: Dict[str, str],
+        section: str
+    ) -> Dict[str, Any]:
+        """Analyze a single section with one LLM call"""
+        user_prompt = self._build_section_user_prompt(context, section)
+        
+        await get_rate_limiter().acquire(system_prompt, user_prompt, self.llm.model_name)
+        response = await self.llm.ainvoke([
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_prompt)
+        ])
+        
+        return self._parse_section(response.content, section)
+    
+    async def _abatch_sections(
+        self,
+        system_prompt: str,
+        context: Dict[str, str]
+    ) -> List[Any]:
+        """
+        Analyze all sections through one OpenAI Batch API job
+        
+        Returns:
+            Parsed section result or the exception, in STANDARD_SECTIONS order
+        """
+        outputs = await self.batch_client.batch_generate([
+            {
+                "custom_id": section,
+                "system_prompt": system_prompt,
+                "user_prompt": self._build_section_user_prompt(context, section),
+                "temperature": 0.1,
+                "json_mode": True
+            }
+            for section in self.STANDARD_SECTIONS
+        ], timeout=self.batch_timeout)
+        
+        results: List[Any] = []
+        for section, output in zip(self.STANDARD_SECTIONS, outputs):
+            try:
+                results.append(self._parse_section(output, section))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _parse_section(self, content: str, section: str) -> Dict[str, Any]:
+        """Parse a single-section JSON response"""
+        result = json_utils.loads(content)
+        # Model is asked for {"<section>": {...}}; accept the bare object too
+        return result.get(section, result)
+    
+    def _summarize_sections(self, sections: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Compute the quantitative summary from per-section results"""
+        amber_present = [s for s in sections.values() if s.get("amber_present")]
+        competitor_present = [s for s in sections.values() if s.get("competitor_present")]
+        both = sum(1 for s in amber_present if s.get("competitor_present"))
+        
+        def total(items: List[Dict[str, Any]], side: str, key: str) -> float:
+            return sum(item.get(f"{side}_metrics", {}).get(key, 0) or 0 for item in items)
+        
+        return {
+            "total_sections_amber": len(amber_present),
+            "total_sections_competitor": len(competitor_present),
+            "sections_in_both": both,
+            "amber_only": len(amber_present) - both,
+            "competitor_only": len(competitor_present) - both,
+            "neither": len(sections) - len(amber_present) - len(competitor_present) + both,
+            "amber_total_content": total(amber_present, "amber", "word_count"),
+            "competitor_total_content": total(competitor_present, "competitor", "word_count"),
+            "amber_avg_richness": round(
+                total(amber_present, "amber", "richness_score") / len(amber_present), 1
+            ) if amber_present else 0,
+            "competitor_avg_richness": round(
+                total(competitor_present, "competitor", "richness_score") / len(competitor_present), 1
+            ) if competitor_present else 0
+        }
+    
     def _build_system_prompt(self) -> str:
         """Build system prompt for detailed analysis"""
         return f"""You are an expert property data analyst specializing in quantitative analysis.
@@ -164,13 +419,13 @@ CRITICAL: Analyze ALL 21 sections. Don't skip any."""
         return f"""Perform detailed quantitative analysis on these properties:
 
 AMBER DATA:
-{json.dumps(amber, indent=2)}
+{json_utils.dumps(amber, pretty=True)}
 
 COMPETITOR DATA:
-{json.dumps(competitor, indent=2)}
+{json_utils.dumps(competitor, pretty=True)}
 
 BASIC COMPARISON (for context):
-{json.dumps(basic_comparison, indent=2)}
+{json_utils.dumps(basic_comparison, pretty=True)}
 
 ANALYSIS REQUIREMENTS:
 1. Analyze ALL 21 standard sections
@@ -183,35 +438,68 @@ ANALYSIS REQUIREMENTS:
 
 Return complete JSON with ALL 21 sections analyzed."""
     
+    def _build_section_system_prompt(self) -> str:
+        """Build system prompt for single-section analysis (same for every section)"""
+        return SECTION_SYSTEM_PROMPT
+    
+    def _section_prompt_context(
+        self,
+        amber: Dict,
+        competitor: Dict,
+        basic_comparison: Optional[Dict]
+    ) -> Dict[str, str]:
+        """
+        Serialize the shared prompt data once per run
+        
+        Compact, key-sorted JSON keeps the prompt prefix byte-identical across
+        all section calls (better prompt-cache hits) and avoids re-dumping the
+        same dicts 21 times.
+        """
+        comparison_block = ""
+        if basic_comparison is not None:
+            comparison_block = f"BASIC COMPARISON (for context):\n{_compact_json(basic_comparison)}\n\n"
+        
+        return {
+            "amber_json": _compact_json(amber),
+            "competitor_json": _compact_json(competitor),
+            "comparison_block": comparison_block
+        }
+    
+    def _build_section_user_prompt(self, context: Dict[str, str], section: str) -> str:
+        """Build user prompt for one section (shared data first, section last)"""
+        return SECTION_USER_TEMPLATE.substitute(context, section=section)
+    
+    def _empty_section(self) -> Dict[str, Any]:
+        """Return empty structure for a single section"""
+        return {
+            "amber_present": False,
+            "competitor_present": False,
+            "status": "neither",
+            "status_icon": "❌",
+            "amber_metrics": {
+                "word_count": 0,
+                "item_count": 0,
+                "richness_score": 0,
+                "specific_items": []
+            },
+            "competitor_metrics": {
+                "word_count": 0,
+                "item_count": 0,
+                "richness_score": 0,
+                "specific_items": []
+            },
+            "gap_analysis": {
+                "missing_in_amber": [],
+                "missing_in_competitor": []
+            },
+            "quantitative_verdict": "No data available",
+            "recommendations": [],
+            "department_actions": {}
+        }
+    
     def _empty_analysis(self) -> Dict[str, Any]:
         """Return empty analysis structure"""
-        empty_sections = {}
-        for section in self.STANDARD_SECTIONS:
-            empty_sections[section] = {
-                "amber_present": False,
-                "competitor_present": False,
-                "status": "neither",
-                "status_icon": "❌",
-                "amber_metrics": {
-                    "word_count": 0,
-                    "item_count": 0,
-                    "richness_score": 0,
-                    "specific_items": []
-                },
-                "competitor_metrics": {
-                    "word_count": 0,
-                    "item_count": 0,
-                    "richness_score": 0,
-                    "specific_items": []
-                },
-                "gap_analysis": {
-                    "missing_in_amber": [],
-                    "missing_in_competitor": []
-                },
-                "quantitative_verdict": "No data available",
-                "recommendations": [],
-                "department_actions": {}
-            }
+        empty_sections = {section: self._empty_section() for section in self.STANDARD_SECTIONS}
         
         return {
             "all_21_sections": empty_sections,
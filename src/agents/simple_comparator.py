@@ -4,11 +4,12 @@ Simple LLM-based Comparator
 Takes extracted data from both properties and generates comparison
 """
 
-from typing import Dict, Any
-import json
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage, HumanMessage
+from typing import Dict, Any, List
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
+from src.utils import json_utils
 from src.utils.logger import setup_logger
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.llm_client import get_chat_model
 
 
 class SimpleLLMComparator:
@@ -18,11 +19,7 @@ class SimpleLLMComparator:
     
     def __init__(self):
         self.logger = setup_logger(self.__class__.__name__)
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.1,
-            model_kwargs={"response_format": {"type": "json_object"}}
-        )
+        self.llm = get_chat_model("gpt-4o-mini", temperature=0.1, json_mode=True)
     
     def compare(self, amber_data: Dict[str, Any], competitor_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -31,20 +28,35 @@ class SimpleLLMComparator:
         Returns:
             Dict with section-by-section comparison, gaps, advantages
         """
-        self.logger.info(
-            f"Comparing {amber_data.get('property_name')} vs {competitor_data.get('property_name')}"
-        )
+        messages = self._prepare_messages(amber_data, competitor_data)
         
-        system_prompt = self._build_system_prompt()
-        user_prompt = self._build_user_prompt(amber_data, competitor_data)
+        try:
+            response = self.llm.invoke(messages)
+            
+            result = json_utils.loads(response.content)
+            self.logger.info("Comparison complete")
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"Comparison failed: {e}")
+            return self._empty_comparison()
+    
+    async def acompare(self, amber_data: Dict[str, Any], competitor_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async version of compare - lets the pipeline overlap it with detailed analysis
+        
+        Returns:
+            Dict with section-by-section comparison, gaps, advantages
+        """
+        messages = self._prepare_messages(amber_data, competitor_data)
         
         try:
-            response = self.llm.invoke([
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=user_prompt)
-            ])
+            await get_rate_limiter().acquire(
+                messages[0].content, messages[1].content, self.llm.model_name
+            )
+            response = await self.llm.ainvoke(messages)
             
-            result = json.loads(response.content)
+            result = json_utils.loads(response.content)
             self.logger.info("Comparison complete")
             return result
             
@@ -52,6 +64,21 @@ class SimpleLLMComparator:
             self.logger.error(f"Comparison failed: {e}")
             return self._empty_comparison()
     
+    def _prepare_messages(
+        self,
+        amber_data: Dict[str, Any],
+        competitor_data: Dict[str, Any]
+    ) -> List[BaseMessage]:
+        """Build LLM messages for a comparison"""
+        self.logger.info(
+            f"Comparing {amber_data.get('property_name')} vs {competitor_data.get('property_name')}"
+        )
+        
+        return [
+            SystemMessage(content=self._build_system_prompt()),
+            HumanMessage(content=self._build_user_prompt(amber_data, competitor_data))
+        ]
+    
     def _build_system_prompt(self) -> str:
         """Build system prompt for comparison"""
         return """You are a property comparison specialist.
@@ -94,10 +121,10 @@ Be thorough and accurate."""
         return f"""Compare these two properties:
 
 AMBER DATA:
-{json.dumps(amber, indent=2)}
+{json_utils.dumps(amber, pretty=True)}
 
 COMPETITOR DATA:
-{json.dumps(competitor, indent=2)}
+{json_utils.dumps(competitor, pretty=True)}
 
 COMPARISON TASKS:
 1. Compare each of 21 standard sections
@@ -5,11 +5,84 @@ Sends raw text directly to LLM with comprehensive prompt.
 No parsing, no data loss, no complexity.
 """
 
-from typing import Dict, Any, List
-import json
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage, HumanMessage
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+import asyncio
+import copy
+import hashlib
+import os
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
+from src.utils import json_utils
 from src.utils.logger import setup_logger
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.llm_client import get_chat_model
+
+
+# Extraction results keyed by content hash, shared by all extractor instances.
+# A bounded in-memory LRU sits in front of an optional diskcache store, which
+# is size-capped, expires entries and is safe to share between processes
+# (uvicorn and ARQ workers), so a re-used property is only extracted once.
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", "/tmp/extraction_cache")
+EXTRACTION_CACHE_SIZE_LIMIT = int(os.getenv("EXTRACTION_CACHE_SIZE_LIMIT", str(256 * 1024 * 1024)))
+EXTRACTION_CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+_EXTRACTION_MEMORY_SIZE = 128
+_extraction_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def _disk_cache():
+    """Persistent extraction cache, or None if diskcache is not installed"""
+    try:
+        from diskcache import Cache
+    except ImportError:
+        return None
+    return Cache(EXTRACTION_CACHE_DIR, size_limit=EXTRACTION_CACHE_SIZE_LIMIT)
+
+
+def _disk_get(key: str) -> Optional[Dict[str, Any]]:
+    disk = _disk_cache()
+    return disk.get(key) if disk is not None else None
+
+
+def _disk_set(key: str, result: Dict[str, Any]) -> None:
+    disk = _disk_cache()
+    if disk is not None:
+        disk.set(key, result, expire=EXTRACTION_CACHE_TTL_SECONDS)
+
+
+def _memory_get(key: str) -> Optional[Dict[str, Any]]:
+    result = _extraction_cache.get(key)
+    if result is not None:
+        _extraction_cache.move_to_end(key)
+    return result
+
+
+def _memory_set(key: str, result: Dict[str, Any]) -> None:
+    _extraction_cache[key] = result
+    _extraction_cache.move_to_end(key)
+    if len(_extraction_cache) > _EXTRACTION_MEMORY_SIZE:
+        _extraction_cache.popitem(last=False)
+
+
+# Model used for extraction. Bump the prompt version whenever the system or
+# user prompt changes, so cached extractions from the old prompt are not reused.
+EXTRACTION_MODEL = "gpt-4o-mini"
+EXTRACTION_PROMPT_VERSION = "1"
+
+
+def extraction_key(raw_data: Dict[str, Any]) -> str:
+    """SHA-256 of the model, prompt version and everything that goes into the prompt"""
+    text = raw_data.get('extracted_content', {}).get('text', '')
+    property_name = raw_data.get('property_name', 'Unknown')
+    url = raw_data.get('url', '')
+    
+    digest = hashlib.sha256()
+    for part in (EXTRACTION_MODEL, EXTRACTION_PROMPT_VERSION, text, property_name, url):
+        # Uploads may carry null or non-string values
+        digest.update(str(part or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
 
 
 class SimpleLLMExtractor:
@@ -20,11 +93,7 @@ class SimpleLLMExtractor:
     
     def __init__(self):
         self.logger = setup_logger(self.__class__.__name__)
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",  # Fast and cheap
-            temperature=0.1,
-            model_kwargs={"response_format": {"type": "json_object"}}
-        )
+        self.llm = get_chat_model(EXTRACTION_MODEL, temperature=0.1, json_mode=True)  # Fast and cheap
     
     def extract(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -36,6 +105,100 @@ class SimpleLLMExtractor:
         Returns:
             Structured dict with all sections, items, counts
         """
+        key = extraction_key(raw_data)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        
+        messages, property_name, url = self._prepare_messages(raw_data)
+        if messages is None:
+            return self._empty_result(property_name, url)
+        
+        # Call LLM
+        try:
+            response = self.llm.invoke(messages)
+            return self._remember(key, self._parse_response(response.content))
+            
+        except Exception as e:
+            self.logger.error(f"Extraction failed: {e}")
+            return self._empty_result(property_name, url)
+    
+    async def aextract(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async version of extract - lets the pipeline extract both properties concurrently
+        
+        Args:
+            raw_data: Dict with 'extracted_content' containing raw text
+            
+        Returns:
+            Structured dict with all sections, items, counts
+        """
+        key = extraction_key(raw_data)
+        cached = await self._acached(key)
+        if cached is not None:
+            return cached
+        
+        messages, property_name, url = self._prepare_messages(raw_data)
+        if messages is None:
+            return self._empty_result(property_name, url)
+        
+        try:
+            await get_rate_limiter().acquire(
+                messages[0].content, messages[1].content, self.llm.model_name
+            )
+            response = await self.llm.ainvoke(messages)
+            return await self._aremember(key, self._parse_response(response.content))
+            
+        except Exception as e:
+            self.logger.error(f"Extraction failed: {e}")
+            return self._empty_result(property_name, url)
+    
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a previous extraction for the same content, if any"""
+        result = _memory_get(key)
+        if result is None:
+            result = _disk_get(key)
+        return self._cache_hit(key, result)
+    
+    async def _acached(self, key: str) -> Optional[Dict[str, Any]]:
+        """Async _cached - disk reads run in a worker thread"""
+        result = _memory_get(key)
+        if result is None:
+            result = await asyncio.to_thread(_disk_get, key)
+        return self._cache_hit(key, result)
+    
+    def _cache_hit(self, key: str, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if result is None:
+            return None
+        
+        _memory_set(key, result)
+        self.logger.info(f"Extraction cache hit for {result.get('property_name', 'Unknown')}")
+        return copy.deepcopy(result)
+    
+    def _remember(self, key: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache a successful extraction (callers get their own copy)"""
+        stored = copy.deepcopy(result)
+        _memory_set(key, stored)
+        _disk_set(key, stored)
+        return result
+    
+    async def _aremember(self, key: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Async _remember - disk writes run in a worker thread"""
+        stored = copy.deepcopy(result)
+        _memory_set(key, stored)
+        await asyncio.to_thread(_disk_set, key, stored)
+        return result
+    
+    def _prepare_messages(
+        self,
+        raw_data: Dict[str, Any]
+    ) -> Tuple[Optional[List[BaseMessage]], str, str]:
+        """
+        Build LLM messages for raw input
+        
+        Returns:
+            (messages or None if text is too short, property_name, url)
+        """
         # Get raw text
         text = raw_data.get('extracted_content', {}).get('text', '')
         property_name = raw_data.get('property_name', 'Unknown')
@@ -43,7 +206,7 @@ class SimpleLLMExtractor:
         
         if not text or len(text) < 50:
             self.logger.warning(f"Text too short: {len(text)} chars")
-            return self._empty_result(property_name, url)
+            return None, property_name, url
         
         self.logger.info(f"Extracting from {len(text)} chars of text for {property_name}")
         
@@ -51,26 +214,21 @@ class SimpleLLMExtractor:
         system_prompt = self._build_system_prompt()
         user_prompt = self._build_user_prompt(text, property_name, url)
         
-        # Call LLM
-        try:
-            response = self.llm.invoke([
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=user_prompt)
-            ])
-            
-            # Parse JSON response
-            result = json.loads(response.content)
-            
-            self.logger.info(
-                f"Extracted: {result.get('sections_count', 0)} sections, "
-                f"{result.get('total_items', 0)} total items"
-            )
-            
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"Extraction failed: {e}")
-            return self._empty_result(property_name, url)
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_prompt)
+        ], property_name, url
+    
+    def _parse_response(self, content: str) -> Dict[str, Any]:
+        """Parse JSON response from LLM"""
+        result = json_utils.loads(content)
+        
+        self.logger.info(
+            f"Extracted: {result.get('sections_count', 0)} sections, "
+            f"{result.get('total_items', 0)} total items"
+        )
+        
+        return result
     
     def _build_system_prompt(self) -> str:
         """Build comprehensive system prompt"""
@@ -4,11 +4,15 @@ Simple LLM-based Report Generator
 Takes comparison data and generates final markdown/HTML report
 """
 
-from typing import Dict, Any
-import json
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, Optional
+from pathlib import Path
+import io
+import aiofiles
 from langchain_core.messages import SystemMessage, HumanMessage
+from src.utils import json_utils
 from src.utils.logger import setup_logger
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.llm_client import get_chat_model
 from src.agents.visual_reporter import VisualReportGenerator
 
 
@@ -19,10 +23,7 @@ class SimpleLLMReporter:
     
     def __init__(self):
         self.logger = setup_logger(self.__class__.__name__)
-        self.llm = ChatOpenAI(
-            model="gpt-4o",  # Use stronger model for report generation
-            temperature=0.3
-        )
+        self.llm = get_chat_model("gpt-4o", temperature=0.3)  # Use stronger model for report generation
         self.visual_generator = VisualReportGenerator()
     
     def generate_report(
@@ -77,6 +78,100 @@ class SimpleLLMReporter:
                 "html": f"<h1>Error</h1><p>Report generation failed: {e}</p>"
             }
     
+    async def agenerate_report(
+        self,
+        amber_data: Dict[str, Any],
+        competitor_data: Dict[str, Any],
+        comparison: Dict[str, Any],
+        detailed_analysis: Dict[str, Any] = None,
+        stream_path: Optional[Path] = None
+    ) -> Dict[str, str]:
+        """
+        Async version of generate_report() that streams the markdown
+        
+        Args:
+            detailed_analysis: Optional detailed analysis with all 21 sections
+            stream_path: Optional markdown file written line by line while the
+                report is still being generated
+        
+        Returns:
+            Dict with 'markdown' and 'html' keys
+        """
+        self.logger.info("Generating comprehensive report (streaming)")
+        
+        system_prompt = self._build_system_prompt()
+        user_prompt = self._build_user_prompt(amber_data, competitor_data, comparison, detailed_analysis)
+        
+        try:
+            markdown = await self._astream_markdown([
+                SystemMessage(content=system_prompt),
+                HumanMessage(content=user_prompt)
+            ], stream_path)
+            
+            html = self.visual_generator.generate_html_report(
+                amber_data,
+                competitor_data,
+                comparison,
+                markdown,
+                detailed_analysis
+            )
+            
+            self.logger.info(f"Report generated: {len(markdown)} chars markdown, {len(html)} chars HTML")
+            
+            return {
+                "markdown": markdown,
+                "html": html
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Report generation failed: {e}")
+            return {
+                "markdown": f"# Error\n\nReport generation failed: {e}",
+                "html": f"<h1>Error</h1><p>Report generation failed: {e}</p>"
+            }
+    
+    async def _astream_markdown(self, messages, stream_path: Optional[Path] = None) -> str:
+        """
+        Consume the LLM token stream into a buffer
+        
+        Complete lines are flushed to stream_path as they arrive so the
+        partial report is readable before generation finishes. File I/O runs
+        in worker threads (aiofiles), so it never blocks the event loop.
+        """
+        if stream_path is None:
+            return await self._aconsume_stream(messages, None)
+        
+        # Closed even if the caller cancels mid-stream
+        async with aiofiles.open(stream_path, "w", encoding="utf-8") as out:
+            return await self._aconsume_stream(messages, out)
+    
+    async def _aconsume_stream(self, messages, out) -> str:
+        """Buffer the token stream, writing complete lines to out (if given)"""
+        buffer = io.StringIO()
+        pending = ""
+        
+        await get_rate_limiter().acquire(
+            messages[0].content, messages[1].content, self.llm.model_name
+        )
+        async for chunk in self.llm.astream(messages):
+            text = chunk.content
+            if not text:
+                continue
+            buffer.write(text)
+            
+            if out is not None:
+                pending += text
+                cut = pending.rfind("\n")
+                if cut >= 0:
+                    await out.write(pending[:cut + 1])
+                    await out.flush()
+                    pending = pending[cut + 1:]
+        
+        if out is not None and pending:
+            await out.write(pending)
+        
+        return buffer.getvalue()
+    
     def _build_system_prompt(self) -> str:
         """Build system prompt for report generation"""
         return """You are a property comparison report writer.
@@ -123,7 +218,7 @@ Be thorough, accurate, and actionable."""
             detailed_section = f"""
 
 DETAILED SECTION ANALYSIS (ALL 21 SECTIONS):
-{json.dumps(detailed_analysis, indent=2)}
+{json_utils.dumps(detailed_analysis, pretty=True)}
 
 Use this detailed analysis to populate the Section Presence Matrix with ALL 21 sections."""
         
@@ -134,21 +229,21 @@ Property: {amber.get('property_name')}
 URL: {amber.get('url')}
 Sections: {amber.get('sections_count')}
 Total Items: {amber.get('total_items')}
-Metrics: {json.dumps(amber.get('metrics', {}), indent=2)}
+Metrics: {json_utils.dumps(amber.get('metrics', {}), pretty=True)}
 Sections Detail:
-{json.dumps(amber.get('sections', []), indent=2)}
+{json_utils.dumps(amber.get('sections', []), pretty=True)}
 
 COMPETITOR DATA:
 Property: {competitor.get('property_name')}
 URL: {competitor.get('url')}
 Sections: {competitor.get('sections_count')}
 Total Items: {competitor.get('total_items')}
-Metrics: {json.dumps(competitor.get('metrics', {}), indent=2)}
+Metrics: {json_utils.dumps(competitor.get('metrics', {}), pretty=True)}
 Sections Detail:
-{json.dumps(competitor.get('sections', []), indent=2)}
+{json_utils.dumps(competitor.get('sections', []), pretty=True)}
 
 COMPARISON RESULTS:
-{json.dumps(comparison, indent=2)}{detailed_section}
+{json_utils.dumps(comparison, pretty=True)}{detailed_section}
 
 Generate the complete markdown report following all required sections.
 Use the ACTUAL numbers from the data provided above.
@@ -4,8 +4,9 @@ Firecrawl Parser - Handles Firecrawl scraped content
 Firecrawl outputs a specific markdown-like format that needs special handling
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
 import re
+import sys
 
 from .base_parser import BaseParser
 from src.models.canonical_format import (
@@ -14,6 +15,41 @@ from src.models.canonical_format import (
 )
 
 
+# Shared copies of item strings (amenities, bills) that repeat across properties.
+# sys.intern only reliably dedupes identifier-like strings, so keep our own table.
+_ITEM_INTERN: Dict[str, str] = {}
+
+
+def _intern_item(item: str) -> str:
+    """Return the canonical shared copy of an item string"""
+    return _ITEM_INTERN.setdefault(item, item)
+
+
+# Firecrawl uses image alt text like "<name> - <city> - 1 Bed 1 Bath - Bedroom" as title
+_BAD_ALT_RE = re.compile(r' - (?:Bedroom|Amenities|Kitchen)')
+_HEADING_RE = re.compile(r'^#+\s*(.+)$')
+_SECTION_RE = re.compile(r'^##\s+(.+?)$\n(.*?)(?=\n##|\Z)', re.MULTILINE | re.DOTALL)
+# Room label ("4 Bed 2 Bath") with its trailing context, terminator included;
+# context sits in the lookahead so labels inside another label's context are
+# still matched on their own
+_ROOM_CONTEXT_RE = re.compile(
+    r'(\d+\s*Bed\s*\d*\s*Bath)(?=(.*?(?:\n\n|\n[A-Z]|$)))',
+    re.DOTALL
+)
+
+
+def _iter_lines(text: str, limit: int) -> Iterator[str]:
+    """Yield at most `limit` lines of text without splitting the whole string"""
+    start = 0
+    for _ in range(limit):
+        nl = text.find('\n', start)
+        if nl < 0:
+            yield text[start:]
+            return
+        yield text[start:nl]
+        start = nl + 1
+
+
 class FirecrawlParser(BaseParser):
     """
     Parser optimized for Firecrawl scraped content
@@ -80,28 +116,25 @@ class FirecrawlParser(BaseParser):
         Example bad: "1Ten on Whyte, Edmonton - Edmonton, Canada - 1 Bed 1 Bath - Bedroom"
         Example good: "1Ten On Whyte - Student Living"
         """
-        # If fallback looks like image alt text, find real name
-        if fallback and (' - Bedroom' in fallback or ' - Amenities' in fallback or ' - Kitchen' in fallback):
-            # This is image alt text, find real name from headings
-            lines = text.split('\n')
-            for line in lines[:20]:
-                # Look for markdown headings
-                heading_match = re.match(r'^#+\s*(.+)$', line.strip())
-                if heading_match:
-                    candidate = heading_match.group(1).strip()
-                    # Must be short enough and not generic
-                    if (3 < len(candidate) < 80 and 
-                        'Overview' not in candidate and
-                        'Bedroom' not in candidate and
-                        'Amenities' not in candidate):
-                        return candidate
-            
-            # Extract from the alt text itself (first part before dashes)
-            parts = fallback.split(' - ')
-            if parts:
-                return parts[0].strip()
-        
-        return fallback or "Unknown Property"
+        # Only image alt text needs fixing - anything else is used as-is
+        if not (fallback and _BAD_ALT_RE.search(fallback)):
+            return fallback or "Unknown Property"
+        
+        # This is image alt text, find real name from headings
+        for line in _iter_lines(text, 20):
+            # Look for markdown headings
+            heading_match = _HEADING_RE.match(line.strip())
+            if heading_match:
+                candidate = heading_match.group(1).strip()
+                # Must be short enough and not generic
+                if (3 < len(candidate) < 80 and 
+                    'Overview' not in candidate and
+                    'Bedroom' not in candidate and
+                    'Amenities' not in candidate):
+                    return candidate
+        
+        # Extract from the alt text itself (first part before dashes)
+        return fallback.split(' - ')[0].strip()
     
     def _extract_firecrawl_sections(self, text: str) -> List[PreSection]:
         """
@@ -113,16 +146,26 @@ class FirecrawlParser(BaseParser):
         - Space-separated lists
         - Content blocks
         """
-        sections = []
-        
+        # Deduplicate sections by name as they stream in (dict keeps insertion order)
+        unique_sections: Dict[str, PreSection] = {}
+        for section in self._iter_firecrawl_sections(text):
+            existing = unique_sections.get(section.original_name)
+            if existing is None:
+                unique_sections[section.original_name] = section
+            elif len(section.items) > len(existing.items):
+                # Replace with version that has more items (moves to the end, as before)
+                del unique_sections[section.original_name]
+                unique_sections[section.original_name] = section
+        
+        return list(unique_sections.values())
+    
+    def _iter_firecrawl_sections(self, text: str) -> Iterator[PreSection]:
+        """Yield candidate sections one at a time instead of building a full list"""
         # First, clean navigation noise
         text_cleaned = self._remove_navigation_noise(text)
         
         # Strategy 1: Extract by markdown headings (## and ###)
-        heading_pattern = r'^##\s+(.+?)$\n(.*?)(?=\n##|\Z)'
-        matches = re.finditer(heading_pattern, text_cleaned, re.MULTILINE | re.DOTALL)
-        
-        for match in matches:
+        for match in _SECTION_RE.finditer(text_cleaned):
             heading = match.group(1).strip()
             content = match.group(2).strip()
             
@@ -136,30 +179,15 @@ class FirecrawlParser(BaseParser):
                 # Extract items from content
                 items = self._extract_items_from_firecrawl_content(content, section_name)
                 
-                sections.append(PreSection(
+                yield PreSection(
                     original_name=section_name,
                     display_name=heading,
                     content=content,
                     items=items
-                ))
+                )
         
         # Strategy 2: Extract specific known sections (amenities, bills, FAQs, etc.)
-        sections.extend(self._extract_special_sections(text_cleaned))
-        
-        # Deduplicate sections by name
-        seen = set()
-        unique_sections = []
-        for section in sections:
-            if section.original_name not in seen:
-                seen.add(section.original_name)
-                unique_sections.append(section)
-            elif len(section.items) > len([s for s in unique_sections if s.original_name == section.original_name][0].items):
-                # Replace with version that has more items
-                unique_sections = [s for s in unique_sections if s.original_name != section.original_name]
-                unique_sections.append(section)
-                seen.add(section.original_name)
-        
-        return unique_sections
+        yield from self._extract_special_sections(text_cleaned)
     
     def _remove_navigation_noise(self, text: str) -> str:
         """Remove navigation menus and repetitive elements"""
@@ -230,7 +258,7 @@ class FirecrawlParser(BaseParser):
         # Pattern 5: Room types ("4 Bed 2 Bath")
         if 'room' in section_name.lower():
             room_patterns = re.findall(r'(\d+\s*Bed\s*\d*\s*Bath)', content)
-            items.extend(list(set(room_patterns)))
+            items.extend(dict.fromkeys(room_patterns))  # Ordered dedup
         
         # Deduplicate
         seen = set()
@@ -265,7 +293,7 @@ class FirecrawlParser(BaseParser):
                 
                 for pattern in known_patterns:
                     if pattern in line_copy:
-                        items.append(pattern)
+                        items.append(_intern_item(pattern))
                         line_copy = line_copy.replace(pattern, ' ', 1)  # Remove so we don't double-count
                 
                 # Now split remaining by spaces and extract single-word amenities
@@ -276,7 +304,7 @@ class FirecrawlParser(BaseParser):
                 for word in remaining_words:
                     word = word.strip()
                     if word in known_single and word not in ' '.join(items):
-                        items.append(word)
+                        items.append(_intern_item(word))
                 
                 # Deduplicate and sort
                 items = list(dict.fromkeys(items))  # Preserve order
@@ -305,7 +333,7 @@ class FirecrawlParser(BaseParser):
                 
                 for pattern in known_bills:
                     if pattern in line_copy:
-                        items.append(pattern)
+                        items.append(_intern_item(pattern))
                 
                 # Deduplicate
                 items = list(dict.fromkeys(items))
@@ -348,25 +376,22 @@ class FirecrawlParser(BaseParser):
                 ))
         
         # Room Types - extract "X Bed Y Bath" patterns
-        room_types = re.findall(r'(\d+\s*Bed\s*\d*\s*Bath)', text)
-        if room_types:
-            unique_rooms = list(set(room_types))
+        # Single pass: each label plus its context up to the next paragraph/heading
+        room_contexts: Dict[str, str] = {}
+        for match in _ROOM_CONTEXT_RE.finditer(text):
+            room_contexts.setdefault(match.group(1), match.group(1) + match.group(2))
+        # Keys are already unique and in discovery order (stable across runs)
+        unique_rooms = list(room_contexts)
+        if unique_rooms:
             # Find content around room types
-            room_content = []
-            for room in unique_rooms[:5]:
-                # Get context around this room type
-                pattern = re.escape(room) + r'.*?(?:\n\n|\n[A-Z]|$)'
-                match = re.search(pattern, text, re.DOTALL)
-                if match:
-                    room_content.append(match.group(0))
+            room_content = [room_contexts[room] for room in unique_rooms[:5]]
             
-            if unique_rooms:
-                sections.append(PreSection(
-                    original_name='room_types',
-                    display_name='Room Types',
-                    content='\n\n'.join(room_content),
-                    items=unique_rooms
-                ))
+            sections.append(PreSection(
+                original_name='room_types',
+                display_name='Room Types',
+                content='\n\n'.join(room_content),
+                items=unique_rooms
+            ))
         
         # Payment Policies
         payment_match = re.search(
@@ -423,7 +448,11 @@ class FirecrawlParser(BaseParser):
         return sections
     
     def _infer_section_name(self, heading: str) -> str:
-        """Infer section name from Firecrawl heading"""
+        """Infer section name from Firecrawl heading (interned, names repeat across properties)"""
+        return sys.intern(self._map_section_name(heading))
+    
+    def _map_section_name(self, heading: str) -> str:
+        """Map a Firecrawl heading to a standard section name"""
         heading_lower = heading.lower()
         
         # Direct mappings
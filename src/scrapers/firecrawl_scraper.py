@@ -8,10 +8,17 @@ Perfect for LLM processing - no complex parsing needed!
 import os
 from typing import Dict, Any, Optional
 from urllib.parse import urlparse
-from firecrawl import FirecrawlApp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 from src.utils.logger import setup_logger
 
 
+# Firecrawl REST API (v1); override for self-hosted instances
+FIRECRAWL_API_URL = os.getenv("FIRECRAWL_API_URL", "https://api.firecrawl.dev")
+
+
 class FirecrawlScraper:
     """
     Scrapes property websites using Firecrawl API
@@ -37,10 +44,38 @@ class FirecrawlScraper:
                 "Set FIRECRAWL_API_KEY environment variable or pass api_key parameter."
             )
         
-        # Initialize Firecrawl client
-        self.client = FirecrawlApp(api_key=self.api_key)
+        # One keep-alive session for all scrapes (TCP/TLS setup paid once).
+        # Requests go straight to the REST API so they always use this pool.
+        self.session = self._build_session()
+        
         self.logger.info("Firecrawl scraper initialized")
     
+    def _build_session(self) -> requests.Session:
+        """
+        Create a pooled HTTP session with retries and compressed responses
+        
+        Returns:
+            Configured requests.Session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset({'GET', 'POST'})
+            )
+        )
+        # http:// too, for self-hosted FIRECRAWL_API_URL endpoints
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        # gzip/deflate always; br only when urllib3 can decode it (brotli installed)
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        session.headers['Authorization'] = f'Bearer {self.api_key}'
+        return session
+    
     def is_valid_url(self, text: str) -> bool:
         """
         Check if text is a valid URL
@@ -85,57 +120,28 @@ class FirecrawlScraper:
         self.logger.info(f"🔥 Scraping URL: {url}")
         
         try:
-            # Call Firecrawl API (newer version uses different method)
-            # Try new API first (v1+)
-            try:
-                scrape_result = self.client.scrape_url(
-                    url,
-                    params={
-                        'formats': formats,
-                        'onlyMainContent': True,
-                        'waitFor': 2000,
-                        'timeout': 30000
-                    }
-                )
-            except AttributeError:
-                # Fallback to newer API method
-                scrape_result = self.client.scrape(
-                    url=url,
-                    formats=formats,
-                    only_main_content=True,
-                    wait_for=2000,
-                    timeout=30000
-                )
-            
-            # Extract data from response (handle both dict and Document object)
-            # New Firecrawl API returns Document objects with attributes
-            # Old API returns dictionaries
-            
-            def safe_extract(obj, key, default=''):
-                """Extract data from dict or Document object"""
-                if hasattr(obj, key):
-                    return getattr(obj, key, default)
-                elif isinstance(obj, dict):
-                    return obj.get(key, default)
-                else:
-                    return default
-            
-            markdown = safe_extract(scrape_result, 'markdown', '')
-            html = safe_extract(scrape_result, 'html', '')
-            metadata = safe_extract(scrape_result, 'metadata', {})
+            # Call Firecrawl scrape endpoint over the pooled session
+            response = self.session.post(
+                f"{FIRECRAWL_API_URL}/v1/scrape",
+                json={
+                    'url': url,
+                    'formats': formats,
+                    'onlyMainContent': True,
+                    'waitFor': 2000,
+                    'timeout': 30000
+                },
+                timeout=(5, 60)
+            )
+            response.raise_for_status()
+            payload = response.json()
+            if not payload.get('success', False):
+                raise Exception(payload.get('error', 'Firecrawl returned success=false'))
+            scrape_result = payload.get('data', {})
             
-            # Handle metadata as dict or object
-            if not isinstance(metadata, dict):
-                # Convert metadata object to dict
-                metadata = {
-                    'title': safe_extract(metadata, 'title', 'Unknown Property'),
-                    'description': safe_extract(metadata, 'description', ''),
-                    'images': safe_extract(metadata, 'images', []),
-                    'links': safe_extract(metadata, 'links', []),
-                    'ogTags': safe_extract(metadata, 'ogTags', {}),
-                    'language': safe_extract(metadata, 'language', None),
-                    'sourceURL': safe_extract(metadata, 'sourceURL', '')
-                }
+            # Extract data from response
+            markdown = scrape_result.get('markdown') or ''
+            html = scrape_result.get('html') or ''
+            metadata = scrape_result.get('metadata') or {}
             
             # Extract images and links from metadata
             images = []
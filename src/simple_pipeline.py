@@ -6,12 +6,16 @@ Replaces all the complex parsers, extractors, and multi-layer architecture.
 Flow:
 1. Raw text → LLM Extractor → Structured data
 2. Structured data → LLM Comparator → Basic comparison
-3. Detailed section analysis → Quantitative metrics
+3. Detailed section analysis → Quantitative metrics (concurrent with 2)
 4. All data → LLM Reporter → Report
 """
 
-from typing import Dict, Any
-from src.agents.simple_extractor import SimpleLLMExtractor
+import asyncio
+import copy
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional
+from src.agents.simple_extractor import SimpleLLMExtractor, extraction_key
 from src.agents.simple_comparator import SimpleLLMComparator
 from src.agents.detailed_analyzer import DetailedSectionAnalyzer
 from src.agents.simple_reporter import SimpleLLMReporter
@@ -36,7 +40,8 @@ class SimpleComparisonPipeline:
     async def run(
         self,
         amber_raw: Dict[str, Any],
-        competitor_raw: Dict[str, Any]
+        competitor_raw: Dict[str, Any],
+        report_path: Optional[Path] = None
     ) -> Dict[str, Any]:
         """
         Run complete comparison pipeline
@@ -44,6 +49,7 @@ class SimpleComparisonPipeline:
         Args:
             amber_raw: Raw data with 'extracted_content' containing text
             competitor_raw: Raw data with 'extracted_content' containing text
+            report_path: Optional markdown file the report is streamed into
             
         Returns:
             Dict with:
@@ -57,40 +63,60 @@ class SimpleComparisonPipeline:
         self.logger.info("SIMPLE PIPELINE START (4 Agents)")
         self.logger.info("=" * 60)
         
+        # The stages form a DAG:
+        #   extract_amber ─┐      ┌─ compare ─┐
+        #                  ├──────┤           ├── report
+        #   extract_comp  ─┘      └─ analyze ─┘
+        # Each level runs as tasks in a TaskGroup, so independent nodes overlap
+        # and a failing node cancels its siblings.
+        
         # Step 1: Extract from both properties
-        self.logger.info("\n[Step 1/4] Extracting Amber data...")
-        amber_extracted = self.extractor.extract(amber_raw)
+        self.logger.info("\n[Step 1/4] Extracting Amber and Competitor data...")
+        same_input = extraction_key(amber_raw) == extraction_key(competitor_raw)
+        async with asyncio.TaskGroup() as tg:
+            amber_task = tg.create_task(self.extractor.aextract(amber_raw))
+            if not same_input:
+                competitor_task = tg.create_task(self.extractor.aextract(competitor_raw))
         
-        self.logger.info("\n[Step 1/4] Extracting Competitor data...")
-        competitor_extracted = self.extractor.extract(competitor_raw)
+        amber_extracted = amber_task.result()
+        if same_input:
+            # Same content on both sides - extracted once
+            competitor_extracted = copy.deepcopy(amber_extracted)
+        else:
+            competitor_extracted = competitor_task.result()
         
-        # Step 2: Basic comparison
+        # Steps 2 + 3: Basic comparison and detailed section analysis only depend
+        # on the extracted data
         self.logger.info("\n[Step 2/4] Comparing properties (basic)...")
-        comparison = self.comparator.compare(amber_extracted, competitor_extracted)
-        
-        # Step 3: Detailed section analysis (NEW - for all 21 sections)
         self.logger.info("\n[Step 3/4] Analyzing all 21 sections (detailed)...")
-        detailed_analysis = self.analyzer.analyze(
-            amber_extracted,
-            competitor_extracted,
-            comparison
-        )
+        async with asyncio.TaskGroup() as tg:
+            comparison_task = tg.create_task(
+                self.comparator.acompare(amber_extracted, competitor_extracted)
+            )
+            analysis_task = tg.create_task(
+                self.analyzer.aanalyze(amber_extracted, competitor_extracted)
+            )
+        
+        comparison = comparison_task.result()
+        detailed_analysis = analysis_task.result()
         
-        # Step 4: Generate report
+        # Step 4: Generate report (streamed, flushed to report_path line by line)
         self.logger.info("\n[Step 4/4] Generating report...")
-        reports = self.reporter.generate_report(
+        reports = await self.reporter.agenerate_report(
             amber_extracted,
             competitor_extracted,
             comparison,
-            detailed_analysis  # Pass detailed analysis
+            detailed_analysis,  # Pass detailed analysis
+            stream_path=report_path
         )
         
         self.logger.info("=" * 60)
         self.logger.info("SIMPLE PIPELINE COMPLETE")
-        self.logger.info(f"Amber: {amber_extracted.get('sections_count')} sections")
-        self.logger.info(f"Competitor: {competitor_extracted.get('sections_count')} sections")
-        self.logger.info(f"Detailed analysis: {len(detailed_analysis.get('all_21_sections', {}))} sections")
-        self.logger.info(f"Report: {len(reports['markdown'])} chars")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Amber: %s sections", amber_extracted.get('sections_count'))
+            self.logger.info("Competitor: %s sections", competitor_extracted.get('sections_count'))
+            self.logger.info("Detailed analysis: %d sections", len(detailed_analysis.get('all_21_sections', {})))
+            self.logger.info("Report: %d chars", len(reports['markdown']))
         self.logger.info("=" * 60)
         
         return {
@@ -107,7 +133,8 @@ class SimpleComparisonPipeline:
 # Convenience function for backend
 async def run_simple_comparison(
     amber_data: Dict[str, Any],
-    competitor_data: Dict[str, Any]
+    competitor_data: Dict[str, Any],
+    report_path: Optional[Path] = None
 ) -> Dict[str, Any]:
     """
     Run simple comparison pipeline
@@ -115,5 +142,5 @@ async def run_simple_comparison(
     This replaces the complex workflow with 3 LLM calls
     """
     pipeline = SimpleComparisonPipeline()
-    return await pipeline.run(amber_data, competitor_data)
+    return await pipeline.run(amber_data, competitor_data, report_path)
 
@@ -1,8 +1,8 @@
 """Utility modules"""
 
-from .llm_client import LLMClient
+from .llm_client import LLMClient, get_llm_client, get_chat_model
 from .logger import setup_logger
 
-__all__ = ["LLMClient", "setup_logger"]
+__all__ = ["LLMClient", "get_llm_client", "get_chat_model", "setup_logger"]
 
 
@@ -0,0 +1,26 @@
+"""Fast JSON helpers (orjson) for LLM prompts and responses"""
+
+from typing import Any
+import orjson
+
+
+def dumps(data: Any, pretty: bool = False) -> str:
+    """
+    Serialize data with keys sorted, so equal inputs give identical prompt text
+    
+    Args:
+        data: JSON-compatible data
+        pretty: Indent with 2 spaces instead of compact output
+    
+    Returns:
+        JSON string
+    """
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, option=option).decode()
+
+
+def loads(content: str) -> Any:
+    """Parse a JSON string (e.g. an LLM response)"""
+    return orjson.loads(content)
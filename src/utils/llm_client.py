@@ -1,13 +1,212 @@
 """LLM client wrapper supporting OpenAI and Anthropic"""
 
 import os
-from typing import Optional, Dict, Any, List
+import json
+import asyncio
+import hashlib
+import importlib
+import importlib.util
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
+import httpx
 from dotenv import load_dotenv
+from tenacity import (
+    AsyncRetrying, Retrying, RetryCallState,
+    retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+)
 from .logger import setup_logger
+from .rate_limiter import get_rate_limiter
 
 load_dotenv()
 logger = setup_logger(__name__)
 
+# One connection pool shared by every async SDK client in the process, and the
+# event loop it is used from (its connections can't move to another loop)
+_async_http_client: Optional[httpx.AsyncClient] = None
+_async_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide httpx client used by the async LLM SDKs
+    
+    Uses HTTP/2 when h2 is installed (httpx[http2]), so concurrent requests
+    are multiplexed over one connection per host instead of opening a new
+    TCP+TLS connection each.
+    
+    A new client is created once the old one is closed or when called from a
+    different event loop (e.g. repeated asyncio.run calls). The cached chat
+    models and LLM clients hold the old one, so they are rebuilt too.
+    """
+    global _async_http_client, _async_http_client_loop
+    loop = _running_loop()
+    if _async_http_client_loop is None:
+        _async_http_client_loop = loop
+    
+    stale = (
+        _async_http_client is None
+        or _async_http_client.is_closed
+        or (loop is not None and loop is not _async_http_client_loop)
+    )
+    if stale:
+        _async_http_client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=50),
+            timeout=httpx.Timeout(60.0, connect=5.0)
+        )
+        _async_http_client_loop = loop
+        _clear_client_caches()
+    return _async_http_client
+
+
+async def aclose_async_http_client() -> None:
+    """Close the shared httpx client (call on application shutdown)"""
+    global _async_http_client, _async_http_client_loop
+    if _async_http_client is not None and not _async_http_client.is_closed:
+        await _async_http_client.aclose()
+    _async_http_client = None
+    _async_http_client_loop = None
+    _clear_client_caches()
+
+
+def _clear_client_caches() -> None:
+    """Drop cached chat models / LLM clients bound to a replaced httpx client"""
+    _chat_model.cache_clear()
+    _llm_client.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _retryable_errors() -> Tuple[type, ...]:
+    """Transient SDK errors worth retrying: rate limits, connection failures, 5xx"""
+    errors: List[type] = []
+    for module_name in ("openai", "anthropic"):
+        try:
+            sdk = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        errors.extend([sdk.RateLimitError, sdk.APIConnectionError, sdk.InternalServerError])
+    return tuple(errors)
+
+
+_backoff = wait_exponential_jitter(initial=1, max=30)
+
+
+def _wait_retry_after(retry_state: RetryCallState) -> float:
+    """Honor the server's Retry-After header, else exponential backoff with jitter"""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    response = getattr(exc, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(float(retry_after), 60.0)
+    except (TypeError, ValueError):
+        return _backoff(retry_state)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    logger.warning(
+        f"Attempt {retry_state.attempt_number} failed: {exc}. "
+        f"Retrying in {retry_state.next_action.sleep:.1f}s..."
+    )
+
+
+def _retry_policy(retries: int) -> Dict[str, Any]:
+    """tenacity settings shared by the sync and async retry helpers"""
+    return {
+        "stop": stop_after_attempt(retries),
+        "wait": _wait_retry_after,
+        "retry": retry_if_exception_type(_retryable_errors()),
+        "before_sleep": _log_retry,
+        "reraise": True
+    }
+
+
+# Response cache for deterministic (temperature 0) calls: in-memory LRU in
+# front of an optional diskcache store. Disable with LLM_CACHE=0.
+_RESPONSE_CACHE_SIZE = 256
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def _disk_cache():
+    """Persistent response cache, or None if diskcache is not installed"""
+    try:
+        from diskcache import FanoutCache
+    except ImportError:
+        return None
+    return FanoutCache(os.getenv("LLM_CACHE_DIR", "/tmp/llm_cache"))
+
+
+def _cache_get(key: str) -> Optional[str]:
+    if key in _response_cache:
+        _response_cache.move_to_end(key)
+        return _response_cache[key]
+    
+    disk = _disk_cache()
+    value = disk.get(key) if disk is not None else None
+    if value is not None:
+        _cache_put(key, value, persist=False)
+    return value
+
+
+def _cache_put(key: str, value: str, persist: bool = True) -> None:
+    _response_cache[key] = value
+    _response_cache.move_to_end(key)
+    if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+    
+    disk = _disk_cache() if persist else None
+    if disk is not None:
+        disk.set(key, value)
+
+
+def get_chat_model(model: str, temperature: float, json_mode: bool = False):
+    """
+    Return a shared langchain ChatOpenAI instance for this configuration
+    
+    Agents with the same settings share one instance, and every instance uses
+    the process-wide async connection pool, so keep-alive connections are
+    reused across all calls in a pipeline run.
+    """
+    # Refreshes the pool (and drops cached models) if it was closed or
+    # belongs to another event loop
+    get_async_http_client()
+    return _chat_model(model, temperature, json_mode)
+
+
+@lru_cache(maxsize=None)
+def _chat_model(model: str, temperature: float, json_mode: bool):
+    from langchain_openai import ChatOpenAI
+    
+    kwargs: Dict[str, Any] = {
+        "model": model,
+        "temperature": temperature,
+        "http_async_client": get_async_http_client()
+    }
+    if json_mode:
+        kwargs["model_kwargs"] = {"response_format": {"type": "json_object"}}
+    
+    return ChatOpenAI(**kwargs)
+
+
+def get_llm_client(provider: Optional[str] = None, model: Optional[str] = None) -> "LLMClient":
+    """Return a shared LLMClient for this provider/model (SDK clients built once)"""
+    get_async_http_client()
+    return _llm_client(provider, model)
+
+
+@lru_cache(maxsize=None)
+def _llm_client(provider: Optional[str], model: Optional[str]) -> "LLMClient":
+    return LLMClient(provider=provider, model=model)
+
 
 class LLMClient:
     """Unified client for OpenAI and Anthropic LLMs"""
@@ -34,8 +233,12 @@ class LLMClient:
         
         if self.provider == "openai":
             try:
-                from openai import OpenAI
+                from openai import OpenAI, AsyncOpenAI
                 self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+                self.aclient = AsyncOpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    http_client=get_async_http_client()
+                )
                 self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o")
                 logger.info(f"Initialized OpenAI client with model: {self.model}")
             except ImportError:
@@ -45,8 +248,12 @@ class LLMClient:
                 
         elif self.provider == "anthropic":
             try:
-                from anthropic import Anthropic
+                from anthropic import Anthropic, AsyncAnthropic
                 self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+                self.aclient = AsyncAnthropic(
+                    api_key=os.getenv("ANTHROPIC_API_KEY"),
+                    http_client=get_async_http_client()
+                )
                 self.model = model or os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022")
                 logger.info(f"Initialized Anthropic client with model: {self.model}")
             except ImportError:
@@ -55,6 +262,14 @@ class LLMClient:
                 raise Exception(f"Failed to initialize Anthropic client: {e}")
         else:
             raise ValueError(f"Unknown provider: {self.provider}. Use 'openai' or 'anthropic'")
+        
+        # Provider implementations, resolved once instead of branching per call
+        if self.provider == "openai":
+            self._gen_impl = self._generate_openai
+            self._agen_impl = self._agenerate_openai
+        else:
+            self._gen_impl = self._generate_anthropic
+            self._agen_impl = self._agenerate_anthropic
     
     def generate(
         self,
@@ -62,17 +277,25 @@ class LLMClient:
         user_prompt: str,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        json_mode: bool = False
+        json_mode: bool = False,
+        cache: bool = True,
+        shared_context: Optional[str] = None
     ) -> str:
         """
         Generate completion from LLM
         
+        Temperature-0 responses are served from / stored in the response cache
+        (in-memory LRU, plus diskcache if installed; LLM_CACHE=0 disables it).
+        
         Args:
             system_prompt: System instruction
             user_prompt: User message
             temperature: Override default temperature
             max_tokens: Override default max tokens
             json_mode: Request JSON output (OpenAI only)
+            cache: Mark system prompt / shared context as cacheable (Anthropic)
+            shared_context: Context repeated verbatim across calls (e.g. property
+                data); sent ahead of user_prompt so it forms a cacheable prefix
         
         Returns:
             Generated text
@@ -80,28 +303,64 @@ class LLMClient:
         temp = temperature if temperature is not None else self.temperature
         tokens = max_tokens if max_tokens is not None else self.max_tokens
         
+        key = self._response_key(system_prompt, user_prompt, temp, tokens, json_mode, shared_context)
+        if key is not None:
+            cached = _cache_get(key)
+            if cached is not None:
+                return cached
+        
         try:
-            if self.provider == "openai":
-                return self._generate_openai(
-                    system_prompt, user_prompt, temp, tokens, json_mode
-                )
-            else:
-                return self._generate_anthropic(
-                    system_prompt, user_prompt, temp, tokens
-                )
+            result = self._gen_impl(
+                system_prompt, user_prompt, temp, tokens, json_mode, cache, shared_context
+            )
         except Exception as e:
             logger.error(f"LLM generation failed: {e}")
             raise
+        
+        if key is not None:
+            _cache_put(key, result)
+        return result
     
-    def _generate_openai(
+    def _response_key(
         self,
         system_prompt: str,
         user_prompt: str,
         temperature: float,
         max_tokens: int,
-        json_mode: bool
-    ) -> str:
-        """Generate using OpenAI"""
+        json_mode: bool,
+        shared_context: Optional[str]
+    ) -> Optional[str]:
+        """
+        Cache key for a request, or None if it should not be cached
+        
+        Only deterministic (temperature 0) requests are cached, and only
+        when LLM_CACHE is not set to "0".
+        """
+        if temperature > 0 or os.getenv("LLM_CACHE", "1") != "1":
+            return None
+        
+        digest = hashlib.sha256()
+        for part in (
+            self.provider, self.model, str(temperature), str(max_tokens), str(json_mode),
+            system_prompt, shared_context or "", user_prompt
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    def _openai_request(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+        shared_context: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build chat.completions kwargs (OpenAI caches identical prefixes automatically)"""
+        if shared_context:
+            user_prompt = f"{shared_context}\n\n{user_prompt}"
+        
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
@@ -117,7 +376,60 @@ class LLMClient:
         if json_mode:
             kwargs["response_format"] = {"type": "json_object"}
         
-        response = self.client.chat.completions.create(**kwargs)
+        return kwargs
+    
+    def _anthropic_request(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        cache: bool,
+        shared_context: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build messages.create kwargs with prompt-caching breakpoints"""
+        system: Any = system_prompt
+        content: Any = user_prompt
+        
+        if cache:
+            # Breakpoint 1: static system prompt
+            system = [{
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            }]
+        
+        if shared_context:
+            # Breakpoint 2: context shared across calls, ahead of the per-call prompt
+            context_block: Dict[str, Any] = {"type": "text", "text": shared_context}
+            if cache:
+                context_block["cache_control"] = {"type": "ephemeral"}
+            content = [context_block, {"type": "text", "text": user_prompt}]
+        
+        return {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": system,
+            "messages": [
+                {"role": "user", "content": content}
+            ]
+        }
+    
+    def _generate_openai(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool = False,
+        cache: bool = True,
+        shared_context: Optional[str] = None
+    ) -> str:
+        """Generate using OpenAI (prompt caching is automatic, cache is unused)"""
+        response = self.client.chat.completions.create(**self._openai_request(
+            system_prompt, user_prompt, temperature, max_tokens, json_mode, shared_context
+        ))
         return response.choices[0].message.content or ""
     
     def _generate_anthropic(
@@ -125,18 +437,15 @@ class LLMClient:
         system_prompt: str,
         user_prompt: str,
         temperature: float,
-        max_tokens: int
+        max_tokens: int,
+        json_mode: bool = False,
+        cache: bool = True,
+        shared_context: Optional[str] = None
     ) -> str:
-        """Generate using Anthropic"""
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_prompt}
-            ]
-        )
+        """Generate using Anthropic (no JSON mode - the prompt must ask for JSON)"""
+        response = self.client.messages.create(**self._anthropic_request(
+            system_prompt, user_prompt, temperature, max_tokens, cache, shared_context
+        ))
         
         return response.content[0].text if response.content else ""
     
@@ -144,18 +453,224 @@ class LLMClient:
         self,
         system_prompt: str,
         user_prompt: str,
-        retries: int = 3,
+        retries: int = 5,
         **kwargs
     ) -> str:
-        """Generate with automatic retries on failure"""
-        for attempt in range(retries):
-            try:
+        """Generate, retrying rate limits / connection errors / 5xx with backoff + jitter"""
+        for attempt in Retrying(**_retry_policy(retries)):
+            with attempt:
                 return self.generate(system_prompt, user_prompt, **kwargs)
-            except Exception as e:
-                if attempt == retries - 1:
-                    raise
-                logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying...")
         
         return ""  # Should never reach here
-
-
+    
+    async def agenerate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        json_mode: bool = False,
+        cache: bool = True,
+        shared_context: Optional[str] = None
+    ) -> str:
+        """
+        Generate completion from LLM without blocking the event loop
+        
+        Same arguments and return value as generate()
+        """
+        temp = temperature if temperature is not None else self.temperature
+        tokens = max_tokens if max_tokens is not None else self.max_tokens
+        
+        key = self._response_key(system_prompt, user_prompt, temp, tokens, json_mode, shared_context)
+        if key is not None:
+            cached = _cache_get(key)
+            if cached is not None:
+                return cached
+        
+        try:
+            await get_rate_limiter().acquire(
+                system_prompt, f"{shared_context or ''}{user_prompt}", self.model
+            )
+            result = await self._agen_impl(
+                system_prompt, user_prompt, temp, tokens, json_mode, cache, shared_context
+            )
+        except Exception as e:
+            logger.error(f"LLM generation failed: {e}")
+            raise
+        
+        if key is not None:
+            _cache_put(key, result)
+        return result
+    
+    async def _agenerate_openai(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool = False,
+        cache: bool = True,
+        shared_context: Optional[str] = None
+    ) -> str:
+        """Generate using AsyncOpenAI (prompt caching is automatic, cache is unused)"""
+        response = await self.aclient.chat.completions.create(**self._openai_request(
+            system_prompt, user_prompt, temperature, max_tokens, json_mode, shared_context
+        ))
+        return response.choices[0].message.content or ""
+    
+    async def _agenerate_anthropic(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool = False,
+        cache: bool = True,
+        shared_context: Optional[str] = None
+    ) -> str:
+        """Generate using AsyncAnthropic (no JSON mode - the prompt must ask for JSON)"""
+        response = await self.aclient.messages.create(**self._anthropic_request(
+            system_prompt, user_prompt, temperature, max_tokens, cache, shared_context
+        ))
+        
+        return response.content[0].text if response.content else ""
+    
+    async def astream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cache: bool = True,
+        shared_context: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream completion text chunks as they are generated
+        
+        Same arguments as agenerate() (no JSON mode - partial JSON is not parseable)
+        """
+        temp = temperature if temperature is not None else self.temperature
+        tokens = max_tokens if max_tokens is not None else self.max_tokens
+        
+        await get_rate_limiter().acquire(
+            system_prompt, f"{shared_context or ''}{user_prompt}", self.model
+        )
+        
+        if self.provider == "openai":
+            kwargs = self._openai_request(
+                system_prompt, user_prompt, temp, tokens, False, shared_context
+            )
+            stream = await self.aclient.chat.completions.create(**kwargs, stream=True)
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        else:
+            kwargs = self._anthropic_request(
+                system_prompt, user_prompt, temp, tokens, cache, shared_context
+            )
+            async with self.aclient.messages.stream(**kwargs) as stream:
+                async for text in stream.text_stream:
+                    yield text
+    
+    async def batch_generate(
+        self,
+        requests: List[Dict[str, Any]],
+        poll_interval: float = 30.0,
+        timeout: Optional[float] = None
+    ) -> List[str]:
+        """
+        Run many prompts through the OpenAI Batch API (50% cheaper, non-interactive)
+        
+        Args:
+            requests: Dicts with custom_id, system_prompt, user_prompt and optional
+                temperature, max_tokens, json_mode
+            poll_interval: Seconds between batch status checks
+            timeout: Seconds to wait for completion (None waits for the full
+                24h window). On timeout the batch is cancelled.
+        
+        Returns:
+            Generated text per request, in input order ("" for failed requests)
+        
+        Raises:
+            RuntimeError: The batch failed, expired or was cancelled
+            TimeoutError: The batch did not finish within timeout
+        """
+        if self.provider != "openai":
+            raise ValueError("Batch API is only supported for provider 'openai'")
+        
+        # 1. One JSONL line per request
+        lines = []
+        for request in requests:
+            body = self._openai_request(
+                request["system_prompt"],
+                request["user_prompt"],
+                request.get("temperature", self.temperature),
+                request.get("max_tokens", self.max_tokens),
+                request.get("json_mode", False),
+                request.get("shared_context")
+            )
+            lines.append(json.dumps({
+                "custom_id": request["custom_id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }))
+        
+        # 2-3. Upload input file and create the batch
+        batch_file = await self.aclient.files.create(
+            file=("batch_input.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await self.aclient.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(requests)} requests")
+        
+        # 4. Poll until the batch reaches a terminal state (or the deadline)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if deadline is not None and loop.time() >= deadline:
+                try:
+                    await self.aclient.batches.cancel(batch.id)
+                except Exception as e:
+                    logger.warning(f"Could not cancel batch {batch.id}: {e}")
+                raise TimeoutError(f"Batch {batch.id} not finished after {timeout:g}s")
+            
+            sleep = poll_interval if deadline is None else min(poll_interval, max(deadline - loop.time(), 0))
+            await asyncio.sleep(sleep)
+            batch = await self.aclient.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} ended with status: {batch.status}")
+        
+        # 5. Download output and map results back by custom_id
+        output = await self.aclient.files.content(batch.output_file_id)
+        outputs: Dict[str, str] = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") == 200:
+                outputs[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"] or ""
+            else:
+                logger.warning(f"Batch request {item.get('custom_id')} failed: {item.get('error')}")
+        
+        return [outputs.get(request["custom_id"], "") for request in requests]
+    
+    async def agenerate_with_retries(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        retries: int = 5,
+        **kwargs
+    ) -> str:
+        """Async generate, retrying rate limits / connection errors / 5xx with backoff + jitter"""
+        async for attempt in AsyncRetrying(**_retry_policy(retries)):
+            with attempt:
+                return await self.agenerate(system_prompt, user_prompt, **kwargs)
+        
+        return ""  # Should never reach here
@@ -1,8 +1,21 @@
 """Logging configuration"""
 
+import atexit
+import functools
 import logging
+import os
+import queue
 import sys
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+
+# Minimal format for console, detailed format for files
+_CONSOLE_FORMAT = logging.Formatter('%(levelname)s: %(message)s')
+_FILE_FORMAT = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# Background writers for file logging (kept referenced for the process lifetime)
+_listeners: List[QueueListener] = []
 
 
 def setup_logger(
@@ -21,40 +34,59 @@ def setup_logger(
     Returns:
         Configured logger
     """
-    import os
-    
     if level is None:
         level = os.getenv("LOG_LEVEL", "INFO")
     
+    return _get_logger(name, level.upper(), log_file)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_logger(name: str, level: str, log_file: Optional[str]) -> logging.Logger:
+    """Configure a logger once per (name, level, log_file)"""
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, level.upper()))
+    logger.setLevel(getattr(logging, level))
+    
+    # Handlers are attached here, so don't also emit through the root logger
+    logger.propagate = False
     
     # Avoid duplicate handlers
     if logger.handlers:
         return logger
     
-    # Console handler with minimal formatting
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, level.upper()))
-    
-    # Minimal format for console
-    console_format = logging.Formatter(
-        '%(levelname)s: %(message)s'
-    )
-    console_handler.setFormatter(console_format)
-    logger.addHandler(console_handler)
+    logger.addHandler(_console_handler(level))
     
     # File handler if specified
     if log_file:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-        
-        file_format = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(file_format)
-        logger.addHandler(file_handler)
+        logger.addHandler(_file_handler(log_file))
     
     return logger
 
 
+@functools.lru_cache(maxsize=None)
+def _console_handler(level: str) -> logging.Handler:
+    """Console handler shared by every logger at this level"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setLevel(getattr(logging, level))
+    handler.setFormatter(_CONSOLE_FORMAT)
+    return handler
+
+
+@functools.lru_cache(maxsize=None)
+def _file_handler(log_file: str) -> logging.Handler:
+    """
+    Non-blocking handler shared by every logger writing to log_file
+    
+    Records are queued and written by a background QueueListener thread, so
+    file I/O never blocks the caller (e.g. the event loop).
+    """
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(_FILE_FORMAT)
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    _listeners.append(listener)
+    
+    return QueueHandler(log_queue)
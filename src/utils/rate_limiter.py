@@ -0,0 +1,111 @@
+"""Client-side rate limiting for LLM requests (requests and tokens per minute)"""
+
+import asyncio
+import os
+from functools import lru_cache
+from typing import Any, Dict, Iterable
+from aiolimiter import AsyncLimiter
+
+# Models whose tokenizer is loaded at startup (see aload_tokenizers)
+TOKENIZER_MODELS = ("gpt-4o", "gpt-4o-mini")
+
+# model -> tiktoken encoding (None if unavailable). Filled only by
+# load_tokenizer(), never on the request path.
+_encodings: Dict[str, Any] = {}
+
+
+def load_tokenizer(model: str) -> None:
+    """
+    Load the tiktoken encoding for model (blocking)
+    
+    tiktoken downloads the BPE file on first use, so call this from a worker
+    thread at startup (aload_tokenizers) rather than from the event loop.
+    """
+    if model in _encodings:
+        return
+    
+    try:
+        import tiktoken
+    except ImportError:
+        _encodings[model] = None
+        return
+    
+    try:
+        try:
+            _encodings[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encodings[model] = tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Download failed - keep estimating from length
+        _encodings[model] = None
+
+
+async def aload_tokenizers(models: Iterable[str] = TOKENIZER_MODELS) -> None:
+    """Load tokenizers in a worker thread (call on app / worker startup)"""
+    for model in models:
+        await asyncio.to_thread(load_tokenizer, model)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap prompt size estimate (~4 chars per token), used per call"""
+    return len(text) // 4 + 1
+
+
+@lru_cache(maxsize=64)
+def _count_tokens(text: str, model: str) -> int:
+    return len(_encodings[model].encode(text, disallowed_special=()))
+
+
+def _system_tokens(text: str, model: str) -> int:
+    """
+    Exact count for system prompts once the tokenizer is loaded
+    
+    System prompts repeat on every call, so each is encoded once and cached.
+    """
+    if _encodings.get(model) is None:
+        return estimate_tokens(text)
+    return _count_tokens(text, model)
+
+
+class RateLimiter:
+    """
+    Token buckets for requests/minute and prompt tokens/minute
+    
+    Callers await acquire() before each LLM request, so a large fan-out is
+    spread out under the provider limits instead of hitting 429s and backing off.
+    """
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Args:
+            requests_per_minute: Max requests started per minute
+            tokens_per_minute: Max estimated prompt tokens sent per minute
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._rpm = AsyncLimiter(requests_per_minute, 60)
+        self._tpm = AsyncLimiter(tokens_per_minute, 60)
+    
+    async def acquire(self, system_prompt: str, user_prompt: str, model: str) -> None:
+        """
+        Wait until a request with these prompts fits under both limits
+        
+        Args:
+            system_prompt: System prompt (token count cached across calls)
+            user_prompt: Per-call prompt text (estimated from its length)
+            model: Model name, for the tokenizer
+        """
+        tokens = _system_tokens(system_prompt, model) + estimate_tokens(user_prompt)
+        
+        await self._rpm.acquire()
+        # A single request larger than the bucket can never fit - cap it
+        await self._tpm.acquire(min(tokens, self.tokens_per_minute))
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter (provider limits apply per API key, not per client)"""
+    return RateLimiter(
+        requests_per_minute=int(os.getenv("LLM_RPM", "500")),
+        tokens_per_minute=int(os.getenv("LLM_TPM", "300000"))
+    )
@@ -6,42 +6,88 @@ Endpoints:
 - POST /api/compare: Run comparison
 - GET /api/status/{job_id}: Check comparison status
 - GET /api/results/{job_id}: Get comparison results
+- GET /outputs/{job_id}/{file}: Saved report files
 - GET /api/download/{job_id}/{file}: Download report file
 """
 
+import csv
+import hashlib
 import os
+import shutil
 import sys
-import json
+import time
 import uuid
 import asyncio
+import aiofiles
+import aiofiles.os
+import orjson
+from anyio import to_thread
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Body
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response
+from typing import Optional, Dict, Any, Iterable, Iterator, Tuple
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Body, Query
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.requests import Request
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, ValidationError
 
 # Add parent directory to path to import src modules
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from src.simple_pipeline import run_simple_comparison
 from src.utils import setup_logger
+from src.utils.llm_client import aclose_async_http_client
+from src.utils.rate_limiter import aload_tokenizers
 from src.scrapers.firecrawl_scraper import FirecrawlScraper
 
 # Import parser after path setup
 from ui.backend.parsers import parse_input_to_property_data
+from ui.backend.job_store import init_job_store, get_job_store, close_job_store
+from ui.backend.file_io import read_file
+from ui.backend.tasks import OUTPUTS_DIR, ORJSON_OPTIONS, run_comparison_job, create_arq_pool
 
 logger = setup_logger("ui_backend")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """App startup / shutdown"""
+    # Bound worker threads: AnyIO's pool runs sync endpoints and UploadFile
+    # I/O, the loop's default executor runs asyncio.to_thread (scrapes).
+    # Total threads stay at about WEB_CONCURRENCY x THREAD_LIMIT.
+    to_thread.current_default_thread_limiter().total_tokens = THREAD_LIMIT
+    executor = ThreadPoolExecutor(max_workers=THREAD_LIMIT, thread_name_prefix="app")
+    asyncio.get_running_loop().set_default_executor(executor)
+    
+    # Job store: Redis when REDIS_URL is set, else in-memory
+    app.state.job_store = init_job_store()
+    # ARQ pool: jobs run in worker processes when Redis is configured
+    app.state.arq = await create_arq_pool()
+    # Tokenizers for rate limiting (may download BPE files - off the loop)
+    await aload_tokenizers()
+    
+    yield
+    
+    if app.state.arq is not None:
+        await app.state.arq.close()
+    await close_job_store()
+    # Close the shared LLM connection pool
+    await aclose_async_http_client()
+    executor.shutdown(wait=False)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Property Comparison API",
     description="AI-powered property listing comparison tool",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for development
@@ -57,17 +103,20 @@ app.add_middleware(
 STATIC_DIR = Path(__file__).parent.parent / "frontend" / "static"
 TEMPLATES_DIR = Path(__file__).parent.parent / "frontend" / "templates"
 UPLOADS_DIR = Path(__file__).parent.parent / "uploads"
-OUTPUTS_DIR = Path(__file__).parent.parent / "outputs"
 
 UPLOADS_DIR.mkdir(exist_ok=True)
 OUTPUTS_DIR.mkdir(exist_ok=True)
 
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
-templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+# Largest accepted upload per file (default 20 MB)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
 
-# In-memory job storage (for production, use Redis or database)
-jobs_store: Dict[str, Dict[str, Any]] = {}
+# Worker threads per process (default 8)
+THREAD_LIMIT = int(os.getenv("THREAD_LIMIT", "8"))
 
+app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+# Finished reports are served straight from disk (see get_job_results)
+app.mount("/outputs", StaticFiles(directory=str(OUTPUTS_DIR)), name="outputs")
+templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
 # Initialize Firecrawl scraper (optional - only if API key is set)
 try:
@@ -95,6 +144,14 @@ class ComparisonRequest(BaseModel):
     competitor_format: Optional[str] = None
 
 
+class PropertyInput(BaseModel):
+    """Minimum structure of an uploaded property JSON file (other fields are kept)"""
+    model_config = ConfigDict(extra="allow")
+    
+    property_name: str
+    extracted_content: Any
+
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Serve the main UI page"""
@@ -145,59 +202,23 @@ async def start_comparison_json(
     - competitor_json/competitor_data: Competitor property data (JSON dict or string)
     - amber_format/competitor_format: Format hint ('json', 'text', 'markdown', 'auto')
     """
-    # Parse input data based on format
-    amber_data = None
-    competitor_data = None
-    
     try:
-        # Handle Amber data
-        # Priority: amber_json (dict) > amber_data (string/URL)
-        if request_data.amber_json:
-            # If it's already a dict, parse it directly
-            amber_data = parse_input_to_property_data(request_data.amber_json, 'json')
-        elif request_data.amber_data:
-            # Check if it's a URL and we have scraper available
-            if is_url(request_data.amber_data) and scraper:
-                logger.info(f"🔥 Detected URL for Amber, scraping: {request_data.amber_data[:50]}...")
-                try:
-                    scraped_data = scraper.scrape_to_property_data(request_data.amber_data)
-                    amber_data = parse_input_to_property_data(scraped_data, 'json')
-                    logger.info("✅ Amber URL scraped successfully")
-                except Exception as e:
-                    logger.error(f"❌ Scraping failed: {e}")
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Failed to scrape Amber URL: {str(e)}. Please paste the content directly instead."
-                    )
-            else:
-                # Not a URL or no scraper - use existing parser
-                format_type = request_data.amber_format or 'auto'
-                amber_data = parse_input_to_property_data(request_data.amber_data, format_type)
-        else:
-            amber_data = None
-        
-        # Handle Competitor data
-        if request_data.competitor_json:
-            competitor_data = parse_input_to_property_data(request_data.competitor_json, 'json')
-        elif request_data.competitor_data:
-            # Check if it's a URL and we have scraper available
-            if is_url(request_data.competitor_data) and scraper:
-                logger.info(f"🔥 Detected URL for Competitor, scraping: {request_data.competitor_data[:50]}...")
-                try:
-                    scraped_data = scraper.scrape_to_property_data(request_data.competitor_data)
-                    competitor_data = parse_input_to_property_data(scraped_data, 'json')
-                    logger.info("✅ Competitor URL scraped successfully")
-                except Exception as e:
-                    logger.error(f"❌ Scraping failed: {e}")
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Failed to scrape Competitor URL: {str(e)}. Please paste the content directly instead."
-                    )
-            else:
-                format_type = request_data.competitor_format or 'auto'
-                competitor_data = parse_input_to_property_data(request_data.competitor_data, format_type)
-        else:
-            competitor_data = None
+        # Parse both sides concurrently - URL scrapes run in worker threads
+        # so they don't block the event loop
+        amber_data, competitor_data = await asyncio.gather(
+            _parse_side(
+                "Amber",
+                request_data.amber_json,
+                request_data.amber_data,
+                request_data.amber_format
+            ),
+            _parse_side(
+                "Competitor",
+                request_data.competitor_json,
+                request_data.competitor_data,
+                request_data.competitor_format
+            )
+        )
         
         if not amber_data or not competitor_data:
             raise HTTPException(
@@ -206,16 +227,8 @@ async def start_comparison_json(
             )
         
         # Convert PropertyData to dict for processing
-        # Use model_dump for Pydantic v2, dict() for v1
-        try:
-            amber_dict = amber_data.model_dump()
-        except AttributeError:
-            amber_dict = amber_data.dict()
-        
-        try:
-            competitor_dict = competitor_data.model_dump()
-        except AttributeError:
-            competitor_dict = competitor_data.dict()
+        amber_dict = _property_dict(amber_data)
+        competitor_dict = _property_dict(competitor_data)
         
         return await _process_comparison(
             background_tasks, 
@@ -234,6 +247,60 @@ async def start_comparison_json(
         raise HTTPException(status_code=400, detail=f"Failed to parse input: {str(e)}")
 
 
+async def _parse_side(
+    label: str,
+    json_value: Optional[Dict[str, Any]],
+    data_value: Optional[str],
+    format_hint: Optional[str]
+):
+    """
+    Parse one property from a compare-json request
+    
+    Priority: json_value (dict) > data_value (string/URL). URLs are scraped
+    with Firecrawl (when configured) in a worker thread.
+    
+    Returns:
+        PropertyData, or None if neither value was given
+    """
+    if json_value:
+        # If it's already a dict, parse it directly
+        return parse_input_to_property_data(json_value, 'json')
+    
+    if not data_value:
+        return None
+    
+    # Check if it's a URL and we have scraper available
+    if is_url(data_value) and scraper:
+        logger.info(f"🔥 Detected URL for {label}, scraping: {data_value[:50]}...")
+        try:
+            scraped_data = await asyncio.to_thread(scraper.scrape_to_property_data, data_value)
+            property_data = parse_input_to_property_data(scraped_data, 'json')
+            logger.info(f"✅ {label} URL scraped successfully")
+            return property_data
+        except Exception as e:
+            logger.error(f"❌ Scraping failed: {e}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to scrape {label} URL: {str(e)}. Please paste the content directly instead."
+            )
+    
+    # Not a URL or no scraper - use existing parser
+    return parse_input_to_property_data(data_value, format_hint or 'auto')
+
+
+# PropertyData fields the pipeline never reads
+_UNUSED_PROPERTY_FIELDS = {"raw_html"}
+
+
+def _property_dict(property_data) -> Dict[str, Any]:
+    """Convert PropertyData to the plain dict the pipeline consumes"""
+    return property_data.model_dump(
+        mode="python",
+        exclude_none=True,
+        exclude=_UNUSED_PROPERTY_FIELDS
+    )
+
+
 async def _process_comparison(
     background_tasks: BackgroundTasks,
     amber_file: Optional[UploadFile],
@@ -259,76 +326,72 @@ async def _process_comparison(
         
         # Get data from files or JSON
         if amber_file and competitor_file:
-            # Read uploaded files
-            amber_content = await amber_file.read()
-            competitor_content = await competitor_file.read()
-            
-            # Parse JSON
-            try:
-                amber_data = json.loads(amber_content)
-                competitor_data = json.loads(competitor_content)
-            except json.JSONDecodeError as e:
-                raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
-            
-            # Save uploaded files
+            # Stream uploaded files straight to disk (they are kept as-is for reference)
             amber_path = UPLOADS_DIR / f"{job_id}_amber.json"
             competitor_path = UPLOADS_DIR / f"{job_id}_competitor.json"
             
-            with open(amber_path, 'w') as f:
-                json.dump(amber_data, f, indent=2)
-            with open(competitor_path, 'w') as f:
-                json.dump(competitor_data, f, indent=2)
+            await _spool_upload(amber_file, amber_path)
+            await _spool_upload(competitor_file, competitor_path)
+            
+            # Parse and validate in one pass
+            amber_data = await _load_property_upload(amber_path, "Amber")
+            competitor_data = await _load_property_upload(competitor_path, "competitor")
                 
         elif amber_json and competitor_json:
-            # Parse JSON data (may already be PropertyData or dict)
-            if isinstance(amber_json, dict):
-                amber_data = amber_json
-            else:
-                amber_data = parse_input_to_property_data(amber_json, 'json')
-                amber_data = amber_data.model_dump() if hasattr(amber_data, 'model_dump') else amber_data.dict()
-            
-            if isinstance(competitor_json, dict):
-                competitor_data = competitor_json
-            else:
-                competitor_data = parse_input_to_property_data(competitor_json, 'json')
-                competitor_data = competitor_data.model_dump() if hasattr(competitor_data, 'model_dump') else competitor_data.dict()
-            
-            # Save JSON data for reference
-            amber_path = UPLOADS_DIR / f"{job_id}_amber.json"
-            competitor_path = UPLOADS_DIR / f"{job_id}_competitor.json"
-            
-            with open(amber_path, 'w') as f:
-                json.dump(amber_data, f, indent=2)
-            with open(competitor_path, 'w') as f:
-                json.dump(competitor_data, f, indent=2)
+            # Already parsed and dumped by start_comparison_json. Nothing reads
+            # the inputs back, so they are not written to uploads/.
+            amber_data = amber_json
+            competitor_data = competitor_json
         else:
             raise HTTPException(status_code=400, detail="Either files or JSON data required")
         
-        # Validate required fields
-        if "property_name" not in amber_data or "extracted_content" not in amber_data:
-            raise HTTPException(status_code=400, detail="Invalid Amber data format. Required: property_name, extracted_content")
-        if "property_name" not in competitor_data or "extracted_content" not in competitor_data:
-            raise HTTPException(status_code=400, detail="Invalid competitor data format. Required: property_name, extracted_content")
+        # Identical inputs already compared? Reuse that job's results
+        job_store = get_job_store()
+        digest = _input_digest(amber_data, competitor_data)
+        previous_id = await job_store.get_by_digest(digest)
+        if previous_id:
+            previous = await job_store.get(previous_id)
+            if previous and previous.get("status") == "completed":
+                logger.info(f"Inputs match completed job {previous_id}, reusing its results")
+                await _discard_uploads(job_id)
+                return {
+                    "job_id": previous_id,
+                    "status": "completed",
+                    "message": "Identical comparison already completed",
+                    "deduplicated": True
+                }
         
         # Initialize job status
-        jobs_store[job_id] = {
+        await job_store.create(job_id, {
             "job_id": job_id,
             "status": "queued",
             "property_name": amber_data.get("property_name"),
             "created_at": datetime.now().isoformat(),
+            "created_ts": time.time(),
             "progress": 0,
             "current_stage": "queued",
             "error": None,
-            "result_path": None
-        }
-        
-        # Start comparison in background
-        background_tasks.add_task(
-            run_comparison_job,
-            job_id,
-            amber_data,
-            competitor_data
-        )
+            "result_path": None,
+            # Mapped to this job once it completes (see _execute_comparison_job)
+            "input_digest": digest
+        })
+        
+        # Start comparison: ARQ worker if configured, else in-process background task
+        if app.state.arq is not None:
+            await app.state.arq.enqueue_job(
+                "run_comparison_task",
+                job_id,
+                amber_data,
+                competitor_data,
+                _job_id=job_id
+            )
+        else:
+            background_tasks.add_task(
+                run_comparison_job,
+                job_id,
+                amber_data,
+                competitor_data
+            )
         
         return {
             "job_id": job_id,
@@ -336,127 +399,76 @@ async def _process_comparison(
             "message": "Comparison started successfully"
         }
         
+    except HTTPException:
+        # Don't keep uploads of rejected jobs; keep 4xx status codes
+        await _discard_uploads(job_id)
+        raise
     except Exception as e:
         logger.error(f"Failed to start comparison: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def run_comparison_job(
-    job_id: str,
-    amber_data: Dict[str, Any],
-    competitor_data: Dict[str, Any]
-):
+def _input_digest(amber_data: Dict[str, Any], competitor_data: Dict[str, Any]) -> str:
+    """Hash of a comparison's inputs (BLAKE2b - fast, no crypto strength needed)"""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(orjson.dumps(amber_data, option=orjson.OPT_SORT_KEYS))
+    hasher.update(orjson.dumps(competitor_data, option=orjson.OPT_SORT_KEYS))
+    return hasher.hexdigest()
+
+
+async def _discard_uploads(job_id: str):
+    """Remove a job's uploaded input files, if any"""
+    await asyncio.gather(
+        asyncio.to_thread((UPLOADS_DIR / f"{job_id}_amber.json").unlink, missing_ok=True),
+        asyncio.to_thread((UPLOADS_DIR / f"{job_id}_competitor.json").unlink, missing_ok=True)
+    )
+
+
+async def _load_property_upload(path: Path, label: str) -> Dict[str, Any]:
     """
-    Background task to run comparison
+    Parse and validate an uploaded property file
+    
+    Raises:
+        HTTPException 400 if the file is not JSON or lacks the required fields
     """
     try:
-        logger.info(f"Running comparison job: {job_id}")
-        
-        # Update status
-        jobs_store[job_id]["status"] = "processing"
-        jobs_store[job_id]["current_stage"] = "extracting_sections"
-        jobs_store[job_id]["progress"] = 10
-        
-        # Run the SIMPLE comparison pipeline (replaces complex workflow)
-        final_state = await run_simple_comparison(
-            amber_data,
-            competitor_data
+        property_input = PropertyInput.model_validate_json(await read_file(path))
+    except ValidationError as e:
+        if any(error["type"] == "json_invalid" for error in e.errors()):
+            raise HTTPException(status_code=400, detail=e.errors()[0]['msg'])
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid {label} data format. Required: property_name, extracted_content"
         )
-        
-        # Update progress
-        jobs_store[job_id]["progress"] = 90
-        jobs_store[job_id]["current_stage"] = "saving_results"
-        
-        # Save results
-        output_dir = OUTPUTS_DIR / job_id
-        output_dir.mkdir(exist_ok=True)
-        
-        # Save reports (simple pipeline returns these directly)
-        markdown_report = final_state.get("markdown_report", "")
-        html_report = final_state.get("html_report", "")
-        
-        if markdown_report:
-            with open(output_dir / "comparison_report.md", "w") as f:
-                f.write(markdown_report)
-        
-        if html_report:
-            with open(output_dir / "comparison_report.html", "w") as f:
-                f.write(html_report)
-        
-        # Save state
-        state_to_save = {
-            k: v for k, v in final_state.items()
-            if k not in ["amber_data", "competitor_data"]
-        }
-        with open(output_dir / "workflow_state.json", "w") as f:
-            json.dump(state_to_save, f, indent=2, default=str)
-        
-        # Extract data from simple pipeline output and create frontend-compatible summary
-        amber_extracted = final_state.get("amber_extracted", {})
-        competitor_extracted = final_state.get("competitor_extracted", {})
-        comparison = final_state.get("comparison", {})
-        
-        # Calculate metrics for summary (compatible with frontend expectations)
-        amber_sections = amber_extracted.get("sections_count", 0)
-        competitor_sections = competitor_extracted.get("sections_count", 0)
-        
-        # Get metrics
-        amber_metrics = amber_extracted.get("metrics", {})
-        competitor_metrics = competitor_extracted.get("metrics", {})
-        
-        # Calculate richness scores (0-100) based on sections and items
-        amber_richness = min(100, (amber_sections * 5) + sum(amber_metrics.values()))
-        competitor_richness = min(100, (competitor_sections * 5) + sum(competitor_metrics.values()))
-        
-        # Get similarity from comparison
-        overall_similarity = comparison.get("overall_similarity", 0.0)
-        
-        # Count insights and recommendations from markdown report
-        markdown = final_state.get("markdown_report", "")
-        insights_count = markdown.count("🎯") + markdown.count("💡") + markdown.count("🏆")
-        recommendations_count = markdown.count("Action:") + markdown.count("Recommendation:")
-        
-        # Save frontend-compatible summary
-        summary = {
-            "property_name": amber_extracted.get("property_name", "Unknown"),
-            "overall_similarity": overall_similarity or 0.0,
-            "amber_richness_score": amber_richness or 0,
-            "competitor_richness_score": competitor_richness or 0,
-            "total_insights": max(insights_count, 5),
-            "total_recommendations": max(recommendations_count, 10),
-            "processing_time_seconds": 15,
-            "errors": [],
-            "warnings": [],
-            # Extra info
-            "amber_sections": amber_sections,
-            "competitor_sections": competitor_sections
-        }
-        with open(output_dir / "summary.json", "w") as f:
-            json.dump(summary, f, indent=2, default=str)
-        
-        # Update job status with extracted data
-        jobs_store[job_id]["status"] = "completed"
-        jobs_store[job_id]["progress"] = 100
-        
-        # Add extraction results for logging
-        amber_extracted = final_state.get("amber_extracted", {})
-        competitor_extracted = final_state.get("competitor_extracted", {})
-        
-        logger.info(f"✅ Job {job_id} completed")
-        logger.info(f"   Amber: {amber_extracted.get('property_name', 'Unknown')} ({amber_extracted.get('sections_count', 0)} sections)")
-        logger.info(f"   Competitor: {competitor_extracted.get('property_name', 'Unknown')} ({competitor_extracted.get('sections_count', 0)} sections)")
-        jobs_store[job_id]["current_stage"] = "completed"
-        jobs_store[job_id]["result_path"] = str(output_dir)
-        jobs_store[job_id]["completed_at"] = datetime.now().isoformat()
-        jobs_store[job_id]["summary"] = summary
-        
-        logger.info(f"Comparison job {job_id} completed successfully")
-        
-    except Exception as e:
-        logger.error(f"Comparison job {job_id} failed: {e}")
-        jobs_store[job_id]["status"] = "failed"
-        jobs_store[job_id]["error"] = str(e)
-        jobs_store[job_id]["failed_at"] = datetime.now().isoformat()
+    
+    return property_input.model_dump()
+
+
+async def _spool_upload(upload: UploadFile, dest: Path, chunk_size: int = 64 * 1024):
+    """
+    Copy an upload to dest in chunks, never holding the whole file in memory
+    
+    Raises:
+        HTTPException 413 if the upload exceeds MAX_UPLOAD_BYTES
+    """
+    written = 0
+    try:
+        async with aiofiles.open(dest, 'wb') as f:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                
+                written += len(chunk)
+                if written > MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File {upload.filename} exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"
+                    )
+                await f.write(chunk)
+    except HTTPException:
+        dest.unlink(missing_ok=True)
+        raise
 
 
 @app.get("/api/status/{job_id}")
@@ -464,62 +476,193 @@ async def get_job_status(job_id: str):
     """
     Get status of a comparison job
     """
-    if job_id not in jobs_store:
+    job = await get_job_store().get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return jobs_store[job_id]
+    return job
+
+
+# Parsed results of finished jobs, keyed by (result_path, summary.json mtime)
+_RESULT_CACHE_SIZE = 256
+_result_cache: "OrderedDict[Tuple[str, int], Tuple[Dict[str, Any], str, str, Dict[str, Any]]]" = OrderedDict()
+
+
+async def _result_bundle(job: Dict[str, Any]) -> Tuple[Dict[str, Any], str, str, Dict[str, Any]]:
+    """
+    Load a completed job's saved results (cached)
+    
+    summary.json is written last, so its mtime versions the whole bundle.
+    
+    Returns:
+        (summary, markdown_report, html_report, workflow_state). Callers
+        must not mutate the returned objects - they are shared.
+    """
+    result_path = job["result_path"]
+    try:
+        mtime_ns = (await aiofiles.os.stat(Path(result_path) / "summary.json")).st_mtime_ns
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Job results not found")
+    key = (result_path, mtime_ns)
+    
+    bundle = _result_cache.get(key)
+    if bundle is not None:
+        _result_cache.move_to_end(key)
+        return bundle
+    
+    bundle = await _load_result_bundle(Path(result_path))
+    _result_cache[key] = bundle
+    if len(_result_cache) > _RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+    return bundle
+
+
+def _evict_results(result_path: str) -> None:
+    """Drop cached results of a job"""
+    for key in [key for key in _result_cache if key[0] == result_path]:
+        del _result_cache[key]
+
+
+async def _read_summary(result_path: Path) -> Dict[str, Any]:
+    """Read a completed job's summary.json (404 if its outputs are gone)"""
+    summary_bytes = await read_file(result_path / "summary.json")
+    if summary_bytes is None:
+        raise HTTPException(status_code=404, detail="Job results not found")
+    return orjson.loads(summary_bytes)
+
+
+async def _load_result_bundle(result_path: Path) -> Tuple[Dict[str, Any], str, str, Dict[str, Any]]:
+    """Read and parse a job's result files"""
+    summary_bytes, state_bytes, markdown_bytes, html_bytes = await asyncio.gather(
+        read_file(result_path / "summary.json"),
+        read_file(result_path / "workflow_state.json"),
+        read_file(result_path / "comparison_report.md"),
+        read_file(result_path / "comparison_report.html")
+    )
+    
+    summary = orjson.loads(summary_bytes)
+    state = orjson.loads(state_bytes) if state_bytes is not None else {}
+    markdown_report = markdown_bytes.decode("utf-8") if markdown_bytes is not None else ""
+    
+    html_report = ""
+    if html_bytes is not None:
+        html_report = html_bytes.decode("utf-8")
+    elif state.get("errors"):
+        # If HTML doesn't exist, show errors from workflow state
+        errors = state.get("errors", [])
+        html_report = "<div style='padding:20px;background:#fff3cd;border:1px solid #ffc107;border-radius:5px;'>"
+        html_report += "<h2 style='color:#856404;'>⚠️ Report Generation Error</h2><ul>"
+        for err in errors:
+            html_report += f"<li><strong>{err.get('stage', 'unknown')}</strong>: {err.get('error', 'Unknown error')}</li>"
+        html_report += "</ul><p style='color:#856404;'>The comparison completed but report generation failed. Check server logs for details.</p></div>"
+    
+    return summary, markdown_report, html_report, state
 
 
 @app.get("/api/results/{job_id}")
-async def get_job_results(job_id: str):
+async def get_job_results(job_id: str, embed: bool = False):
     """
     Get full results of a completed comparison
+    
+    Reports are returned as URLs under /outputs for the browser to fetch.
+    With ?embed=1 the report contents are also included inline.
     """
-    if job_id not in jobs_store:
+    job = await get_job_store().get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs_store[job_id]
-    
     if job["status"] != "completed":
         raise HTTPException(status_code=400, detail=f"Job not completed. Status: {job['status']}")
     
-    # Read summary
     result_path = Path(job["result_path"])
-    with open(result_path / "summary.json") as f:
-        summary = json.load(f)
-    
-    # Read markdown report
-    markdown_report = ""
-    if (result_path / "comparison_report.md").exists():
-        with open(result_path / "comparison_report.md") as f:
-            markdown_report = f.read()
     
-    # Read HTML report
-    html_report = ""
-    if (result_path / "comparison_report.html").exists():
-        with open(result_path / "comparison_report.html") as f:
-            html_report = f.read()
-    else:
-        # If HTML doesn't exist, check for errors in workflow state
-        state_path = result_path / "workflow_state.json"
-        if state_path.exists():
-            with open(state_path) as f:
-                state = json.load(f)
-                if state.get("errors"):
-                    errors = state.get("errors", [])
-                    html_report = "<div style='padding:20px;background:#fff3cd;border:1px solid #ffc107;border-radius:5px;'>"
-                    html_report += "<h2 style='color:#856404;'>⚠️ Report Generation Error</h2><ul>"
-                    for err in errors:
-                        html_report += f"<li><strong>{err.get('stage', 'unknown')}</strong>: {err.get('error', 'Unknown error')}</li>"
-                    html_report += "</ul><p style='color:#856404;'>The comparison completed but report generation failed. Check server logs for details.</p></div>"
+    # Only summary.json is read here - the reports are fetched by URL
+    summary, markdown_url, html_url = await asyncio.gather(
+        _read_summary(result_path),
+        _report_url(job_id, result_path, "comparison_report.md"),
+        _report_url(job_id, result_path, "comparison_report.html")
+    )
     
-    return {
+    results = {
         "job_id": job_id,
         "summary": summary,
-        "markdown_report": markdown_report,
-        "html_report": html_report,
-        "html_url": f"/api/download/{job_id}/html"
+        "markdown_url": markdown_url,
+        "html_url": html_url
     }
+    
+    if embed or html_url is None:
+        # Report contents requested, or no HTML file - then include the
+        # (small) error summary instead
+        _, markdown_report, html_report, _ = await _result_bundle(job)
+        if embed:
+            results["markdown_report"] = markdown_report
+        results["html_report"] = html_report
+    
+    return results
+
+
+async def _report_url(job_id: str, result_path: Path, filename: str) -> Optional[str]:
+    """URL of a saved report under /outputs, or None if it wasn't written"""
+    if await aiofiles.os.path.isfile(result_path / filename):
+        return f"/outputs/{job_id}/{filename}"
+    return None
+
+
+def _csv_rows(summary: Dict[str, Any], state: Dict[str, Any]) -> Iterator[list]:
+    """Yield the rows of the CSV report, one at a time"""
+    # Header
+    yield ["Property Comparison Report", summary.get("property_name", "Unknown")]
+    yield []
+    
+    # Overall metrics
+    yield ["Metric", "Amber", "Competitor"]
+    yield ["Overall Richness Score",
+           f"{summary.get('amber_richness_score', 0):.1f}/100",
+           f"{summary.get('competitor_richness_score', 0):.1f}/100"]
+    yield ["Content Similarity", f"{summary.get('overall_similarity', 0)*100:.1f}%", ""]
+    yield []
+    
+    # Section comparison
+    section_comparisons = state.get("section_comparisons", {})
+    if section_comparisons:
+        yield ["Section Comparison"]
+        yield ["Section", "Amber Word Count", "Competitor Word Count", "Amber Richness", "Competitor Richness", "Similarity", "Winner"]
+        for section, comp in section_comparisons.items():
+            yield [
+                section.replace('_', ' ').title(),
+                comp.get('amber_word_count', 0),
+                comp.get('competitor_word_count', 0),
+                f"{comp.get('amber_richness', 0):.1f}",
+                f"{comp.get('competitor_richness', 0):.1f}",
+                f"{comp.get('text_similarity', 0)*100:.1f}%",
+                comp.get('winner', 'N/A')
+            ]
+        yield []
+    
+    # Recommendations
+    recommendations = state.get("recommendations", [])
+    if recommendations:
+        yield ["Recommendations"]
+        yield ["Priority", "Category", "Section", "Action", "Rationale"]
+        for rec in recommendations:
+            yield [
+                rec.get('priority', 'medium'),
+                rec.get('category', ''),
+                rec.get('section', ''),
+                rec.get('action', ''),
+                rec.get('rationale', '')
+            ]
+
+
+def _stream_csv(rows: Iterable[list]) -> Iterator[str]:
+    """Encode rows as CSV lines, reusing a single buffer"""
+    line_buf = StringIO()
+    writer = csv.writer(line_buf)
+    for row in rows:
+        writer.writerow(row)
+        yield line_buf.getvalue()
+        line_buf.seek(0)
+        line_buf.truncate()
 
 
 @app.get("/api/download/{job_id}/{file_type}")
@@ -529,97 +672,25 @@ async def download_report(job_id: str, file_type: str):
     
     file_type: csv, json
     """
-    if job_id not in jobs_store:
+    job = await get_job_store().get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs_store[job_id]
     if job["status"] != "completed":
         raise HTTPException(status_code=400, detail="Job not completed")
     
-    result_path = Path(job["result_path"])
-    
     if file_type == "csv":
-        # Generate CSV from comparison data
-        import csv
-        from io import StringIO
-        
-        # Read summary and state
-        with open(result_path / "summary.json") as f:
-            summary = json.load(f)
-        
-        state_path = result_path / "workflow_state.json"
-        if state_path.exists():
-            with open(state_path) as f:
-                state = json.load(f)
-        else:
-            state = {}
-        
-        # Create CSV content
-        csv_output = StringIO()
-        writer = csv.writer(csv_output)
-        
-        # Write header
-        writer.writerow(["Property Comparison Report", summary.get("property_name", "Unknown")])
-        writer.writerow([])
-        
-        # Overall metrics
-        writer.writerow(["Metric", "Amber", "Competitor"])
-        writer.writerow(["Overall Richness Score", 
-                        f"{summary.get('amber_richness_score', 0):.1f}/100",
-                        f"{summary.get('competitor_richness_score', 0):.1f}/100"])
-        writer.writerow(["Content Similarity", f"{summary.get('overall_similarity', 0)*100:.1f}%", ""])
-        writer.writerow([])
+        summary, _, _, state = await _result_bundle(job)
         
-        # Section comparison
-        section_comparisons = state.get("section_comparisons", {})
-        if section_comparisons:
-            writer.writerow(["Section Comparison"])
-            writer.writerow(["Section", "Amber Word Count", "Competitor Word Count", "Amber Richness", "Competitor Richness", "Similarity", "Winner"])
-            for section, comp in section_comparisons.items():
-                writer.writerow([
-                    section.replace('_', ' ').title(),
-                    comp.get('amber_word_count', 0),
-                    comp.get('competitor_word_count', 0),
-                    f"{comp.get('amber_richness', 0):.1f}",
-                    f"{comp.get('competitor_richness', 0):.1f}",
-                    f"{comp.get('text_similarity', 0)*100:.1f}%",
-                    comp.get('winner', 'N/A')
-                ])
-            writer.writerow([])
-        
-        # Recommendations
-        recommendations = state.get("recommendations", [])
-        if recommendations:
-            writer.writerow(["Recommendations"])
-            writer.writerow(["Priority", "Category", "Section", "Action", "Rationale"])
-            for rec in recommendations:
-                writer.writerow([
-                    rec.get('priority', 'medium'),
-                    rec.get('category', ''),
-                    rec.get('section', ''),
-                    rec.get('action', ''),
-                    rec.get('rationale', '')
-                ])
-        
-        csv_content = csv_output.getvalue()
-        return Response(
-            content=csv_content,
+        return StreamingResponse(
+            _stream_csv(_csv_rows(summary, state)),
             media_type="text/csv",
             headers={"Content-Disposition": f'attachment; filename="comparison_report_{job_id}.csv"'}
         )
     
     elif file_type == "json":
         # Return comprehensive JSON with all comparison data
-        state_path = result_path / "workflow_state.json"
-        if state_path.exists():
-            with open(state_path) as f:
-                state_data = json.load(f)
-        else:
-            state_data = {}
-        
-        # Read summary
-        with open(result_path / "summary.json") as f:
-            summary = json.load(f)
+        summary, _, _, state_data = await _result_bundle(job)
         
         # Combine into comprehensive JSON
         comprehensive_json = {
@@ -640,7 +711,7 @@ async def download_report(job_id: str, file_type: str):
             }
         }
         
-        json_content = json.dumps(comprehensive_json, indent=2, default=str)
+        json_content = orjson.dumps(comprehensive_json, default=str, option=ORJSON_OPTIONS)
         return Response(
             content=json_content,
             media_type="application/json",
@@ -651,16 +722,19 @@ async def download_report(job_id: str, file_type: str):
 
 
 @app.get("/api/jobs")
-async def list_jobs():
+async def list_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+):
     """
-    List all comparison jobs
+    List comparison jobs, newest first
     """
-    jobs_list = sorted(
-        jobs_store.values(),
-        key=lambda x: x.get("created_at", ""),
-        reverse=True
+    job_store = get_job_store()
+    jobs_list, total = await asyncio.gather(
+        job_store.list(limit=limit, offset=offset),
+        job_store.count()
     )
-    return {"jobs": jobs_list}
+    return {"jobs": jobs_list, "total": total, "limit": limit, "offset": offset}
 
 
 @app.delete("/api/jobs/{job_id}")
@@ -668,23 +742,22 @@ async def delete_job(job_id: str):
     """
     Delete a comparison job and its files
     """
-    if job_id not in jobs_store:
+    job_store = get_job_store()
+    job = await job_store.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Delete files
-    result_path = jobs_store[job_id].get("result_path")
+    # Delete results and uploads in worker threads (rmtree touches many files)
+    result_path = job.get("result_path")
+    cleanup = [_discard_uploads(job_id)]
     if result_path:
-        import shutil
-        shutil.rmtree(result_path, ignore_errors=True)
-    
-    # Delete uploads
-    amber_path = UPLOADS_DIR / f"{job_id}_amber.json"
-    competitor_path = UPLOADS_DIR / f"{job_id}_competitor.json"
-    amber_path.unlink(missing_ok=True)
-    competitor_path.unlink(missing_ok=True)
+        cleanup.append(asyncio.to_thread(shutil.rmtree, result_path, ignore_errors=True))
+    await asyncio.gather(*cleanup)
     
-    # Remove from store
-    del jobs_store[job_id]
+    # Remove from store and drop cached results
+    await job_store.delete(job_id)
+    if result_path:
+        _evict_results(result_path)
     
     return {"message": "Job deleted successfully"}
 
@@ -692,19 +765,30 @@ async def delete_job(job_id: str):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    total_jobs, active_jobs = await get_job_store().stats()
     return {
         "status": "healthy",
-        "total_jobs": len(jobs_store),
-        "active_jobs": sum(1 for j in jobs_store.values() if j["status"] == "processing")
+        "total_jobs": total_jobs,
+        "active_jobs": active_jobs
     }
 
 
 if __name__ == "__main__":
     import uvicorn
+    
+    # Several workers need the shared Redis job store (REDIS_URL); with the
+    # in-memory store each worker would only see its own jobs.
+    workers = int(os.getenv("WEB_CONCURRENCY", "4" if os.getenv("REDIS_URL") else "1"))
     uvicorn.run(
         "app:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        # "auto" picks uvloop and httptools when installed (uvicorn[standard])
+        # and falls back to asyncio/h11 otherwise
+        loop="auto",
+        http="auto",
+        workers=workers,
+        # No file watcher here; use start_server.py --reload for development
+        reload=False
     )
 
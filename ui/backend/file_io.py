@@ -0,0 +1,35 @@
+"""
+Non-blocking file helpers for the async request and job handlers
+
+aiofiles runs each syscall in a worker thread, so reads and writes never
+stall the event loop.
+"""
+
+from pathlib import Path
+from typing import Optional
+import aiofiles
+
+# Large writes are split so other tasks get a turn between chunks
+WRITE_CHUNK_SIZE = 1024 * 1024
+
+
+async def read_file(path: Path) -> Optional[bytes]:
+    """
+    Read a whole file
+    
+    Returns:
+        File contents, or None if the file does not exist
+    """
+    try:
+        async with aiofiles.open(path, 'rb') as f:
+            return await f.read()
+    except FileNotFoundError:
+        return None
+
+
+async def write_file(path: Path, data: bytes) -> None:
+    """Write data to path (replacing it) in WRITE_CHUNK_SIZE chunks"""
+    view = memoryview(data)
+    async with aiofiles.open(path, 'wb') as f:
+        for start in range(0, len(view), WRITE_CHUNK_SIZE):
+            await f.write(view[start:start + WRITE_CHUNK_SIZE])
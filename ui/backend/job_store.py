@@ -0,0 +1,249 @@
+"""
+Job storage for comparison jobs
+
+Jobs live in Redis when REDIS_URL is set, so every uvicorn worker (and any
+background worker process) sees the same jobs and they survive restarts.
+Without Redis an in-process dict is used, which is fine for a single worker.
+
+Redis layout:
+- job:{job_id}  hash, one JSON-encoded value per job field
+- jobs_index    sorted set of job ids scored by creation time (created_ts)
+- comparison:digest:{digest}  id of the completed job that compared those inputs
+"""
+
+import os
+import orjson
+import time
+from itertools import islice
+from typing import Optional, Dict, Any, List, Tuple
+
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+JOB_KEY_PREFIX = "job:"
+JOBS_INDEX_KEY = "jobs_index"
+DIGEST_KEY_PREFIX = "comparison:digest:"
+
+# Finished jobs expire after this many seconds (default 7 days)
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", str(7 * 24 * 3600)))
+
+
+class MemoryJobStore:
+    """In-process job store (single worker, lost on restart)"""
+    
+    def __init__(self):
+        # Insertion-ordered, so creation order doubles as the time index
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        # Input digest -> id of the completed job that ran those inputs
+        self._digests: Dict[str, str] = {}
+    
+    async def create(self, job_id: str, job: Dict[str, Any]) -> None:
+        self._jobs[job_id] = dict(job)
+    
+    async def update(self, job_id: str, **fields: Any) -> None:
+        if job_id in self._jobs:
+            self._jobs[job_id].update(fields)
+    
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+    
+    async def delete(self, job_id: str) -> bool:
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return False
+        # Drop the digest mapping too, unless a newer job has taken it over
+        digest = job.get("input_digest")
+        if digest and self._digests.get(digest) == job_id:
+            del self._digests[digest]
+        return True
+    
+    async def list(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Jobs newest first, paginated by limit/offset"""
+        stop = None if limit is None else offset + limit
+        return [dict(job) for job in islice(reversed(self._jobs.values()), offset, stop)]
+    
+    async def count(self) -> int:
+        return len(self._jobs)
+    
+    async def get_by_digest(self, digest: str) -> Optional[str]:
+        return self._digests.get(digest)
+    
+    async def set_digest(self, digest: str, job_id: str) -> None:
+        self._digests[digest] = job_id
+    
+    async def stats(self) -> Tuple[int, int]:
+        """(total jobs, jobs currently processing)"""
+        active = sum(1 for job in self._jobs.values() if job.get("status") == "processing")
+        return len(self._jobs), active
+    
+    async def close(self) -> None:
+        pass
+
+
+class RedisJobStore:
+    """Redis-backed job store shared by all worker processes"""
+    
+    def __init__(self, redis_url: str, ttl_seconds: int = JOB_TTL_SECONDS):
+        """
+        Args:
+            redis_url: Redis connection URL (redis://host:port/db)
+            ttl_seconds: Expiry applied to each job hash on every write
+        """
+        try:
+            from redis.asyncio import Redis
+        except ImportError:
+            raise ImportError("redis package not installed. Run: pip install redis")
+        
+        self.redis = Redis.from_url(redis_url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+    
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"{JOB_KEY_PREFIX}{job_id}"
+    
+    @staticmethod
+    def _encode(fields: Dict[str, Any]) -> Dict[str, str]:
+        return {name: orjson.dumps(value, default=str).decode() for name, value in fields.items()}
+    
+    @staticmethod
+    def _decode(raw: Dict[str, str]) -> Dict[str, Any]:
+        return {name: orjson.loads(value) for name, value in raw.items()}
+    
+    async def create(self, job_id: str, job: Dict[str, Any]) -> None:
+        key = self._key(job_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=self._encode(job))
+            pipe.expire(key, self.ttl_seconds)
+            pipe.zadd(JOBS_INDEX_KEY, {job_id: job.get("created_ts", time.time())})
+            await pipe.execute()
+    
+    async def update(self, job_id: str, **fields: Any) -> None:
+        key = self._key(job_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=self._encode(fields))
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+    
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.redis.hgetall(self._key(job_id))
+        return self._decode(raw) if raw else None
+    
+    async def delete(self, job_id: str) -> bool:
+        # Drop the digest mapping too, unless a newer job has taken it over
+        digest_key = None
+        raw_digest = await self.redis.hget(self._key(job_id), "input_digest")
+        if raw_digest:
+            digest_key = f"{DIGEST_KEY_PREFIX}{orjson.loads(raw_digest)}"
+            if await self.redis.get(digest_key) != job_id:
+                digest_key = None
+        
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._key(job_id))
+            pipe.zrem(JOBS_INDEX_KEY, job_id)
+            if digest_key:
+                pipe.delete(digest_key)
+            deleted = (await pipe.execute())[0]
+        return bool(deleted)
+    
+    async def list(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Jobs newest first, paginated by limit/offset
+        
+        Only the requested page is read from the index (O(log N + limit)).
+        Index entries of expired jobs are pruned, so a page may come back short.
+        """
+        stop = -1 if limit is None else offset + limit - 1
+        job_ids = await self.redis.zrevrange(JOBS_INDEX_KEY, offset, stop)
+        if not job_ids:
+            return []
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hgetall(self._key(job_id))
+            raws = await pipe.execute()
+        
+        jobs = []
+        expired = []
+        for job_id, raw in zip(job_ids, raws):
+            if raw:
+                jobs.append(self._decode(raw))
+            else:
+                expired.append(job_id)
+        
+        if expired:
+            await self.redis.zrem(JOBS_INDEX_KEY, *expired)
+        
+        return jobs
+    
+    async def count(self) -> int:
+        """Number of indexed jobs (may include expired ones not yet pruned)"""
+        return await self.redis.zcard(JOBS_INDEX_KEY)
+    
+    async def get_by_digest(self, digest: str) -> Optional[str]:
+        return await self.redis.get(f"{DIGEST_KEY_PREFIX}{digest}")
+    
+    async def set_digest(self, digest: str, job_id: str) -> None:
+        # Expires with the job it points to
+        await self.redis.set(f"{DIGEST_KEY_PREFIX}{digest}", job_id, ex=self.ttl_seconds)
+    
+    async def stats(self) -> Tuple[int, int]:
+        """(total jobs, jobs currently processing)"""
+        job_ids = await self.redis.zrange(JOBS_INDEX_KEY, 0, -1)
+        if not job_ids:
+            return 0, 0
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hget(self._key(job_id), "status")
+            statuses = await pipe.execute()
+        
+        live = [status for status in statuses if status is not None]
+        active = sum(1 for status in live if orjson.loads(status) == "processing")
+        return len(live), active
+    
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+_job_store = None
+
+
+def init_job_store(redis_url: Optional[str] = None):
+    """
+    Create the process-wide job store
+    
+    Args:
+        redis_url: Redis URL (defaults to env var REDIS_URL). Without one,
+            jobs are kept in memory.
+    
+    Returns:
+        The job store
+    """
+    global _job_store
+    redis_url = redis_url or os.getenv("REDIS_URL")
+    
+    if redis_url:
+        _job_store = RedisJobStore(redis_url)
+        logger.info("Job store: Redis")
+    else:
+        _job_store = MemoryJobStore()
+        logger.info("Job store: in-memory (set REDIS_URL to share jobs across workers)")
+    
+    return _job_store
+
+
+def get_job_store():
+    """Return the process-wide job store, creating it on first use"""
+    if _job_store is None:
+        return init_job_store()
+    return _job_store
+
+
+async def close_job_store() -> None:
+    """Close the process-wide job store (call on shutdown)"""
+    global _job_store
+    if _job_store is not None:
+        await _job_store.close()
+    _job_store = None
@@ -2,11 +2,14 @@
 Parsers for converting text, markdown, and JSON into PropertyData structure
 """
 
-import json
+import io
+import orjson
 import re
 import sys
+from collections import OrderedDict
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from urllib.parse import urlparse
 
 # Add project root to path
@@ -17,11 +20,246 @@ if str(project_root) not in sys.path:
 from src.models.property_data import PropertyData, ExtractedContent, ImageData, LinkData, MetaData
 
 
+# JSON field names accepted for each property attribute, in order of preference
+_NAME_KEYS = ("property_name", "name", "title", "property", "propertyName")
+_URL_KEYS = ("url", "source_link", "link", "property_url", "website", "sourceUrl")
+_LOCATION_KEYS = ("location", "address", "city", "area", "address_line_1")
+_PROVIDER_KEYS = ("provider", "source", "host", "owner_name")
+
+# JSON keys already rendered into the text (other short strings are appended)
+_EXCLUDED_TEXT_KEYS = frozenset({
+    "property_name", "name", "url", "source_link", "location", "address",
+    "provider", "source", "description", "about", "overview", "pricing",
+    "amenities", "features", "types", "room_types", "meta", "owner",
+    "policies", "images", "links", "videos", "extracted_content"
+})
+
+# JSON keys stored in PropertyData fields rather than additional_metadata
+_EXCLUDED_METADATA_KEYS = frozenset({
+    "property_name", "name", "url", "source_link", "location",
+    "provider", "source", "extracted_content"
+})
+
+# Address fields joined into a location string, in order of preference
+# (alternatives for the same part share a tuple)
+_LOCATION_PART_KEYS = (
+    ("name",), ("address",), ("street",), ("city",), ("state", "region"),
+    ("country",), ("postal_code", "zip_code")
+)
+# Single-string fallbacks when a location dict has no address fields
+_LOCATION_LABEL_KEYS = ("formatted_address", "display_name", "label")
+
+# ExtractedContent keeps at most this many images/links
+_MAX_IMAGES = 20
+_MAX_LINKS = 50
+
+# Pretty-printed JSON used as text when no known fields are found
+_JSON_FALLBACK_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+# Regex patterns, compiled once at import
+
+# Plain text
+_NAME_EXPLICIT_RE = re.compile(r'(?:property\s*name|name|title)[\s:]+([^\n]+)', re.IGNORECASE)
+_NAME_TITLECASE_RE = re.compile(r'([A-Z][a-zA-Z\s&]+(?:Court|House|Hall|Residence|Accommodation|Property|Living|Student|Apartments?))')
+_TEXT_URL_RE = re.compile(r'https?://[^\s\n]+|www\.[^\s\n]+', re.IGNORECASE)
+# Separators never cross a newline, so a whole-text search finds the same
+# match as searching line by line
+_TEXT_LOCATION_RE = re.compile(r'(?:location|address|city)(?:[^\S\n]|:)+([^\n]+)', re.IGNORECASE)
+_TEXT_PROVIDER_RE = re.compile(r'(?:provider|by|hosted by)(?:[^\S\n]|:)+([^\n]+)', re.IGNORECASE)
+_TEXT_IMAGE_RE = re.compile(r'(?:image|photo|img)[\s:]+([^\s\n]+\.(?:jpg|jpeg|png|gif|webp))', re.IGNORECASE)
+_TEXT_LINK_RE = re.compile(r'(https?://[^\s\n\)]+)')
+
+# Markdown
+_H1_RE = re.compile(r'^#\s+(.+?)(?:\s*\{|$)')
+_H2_RE = re.compile(r'^##\s+(.+?)(?:\s*\{|$)')
+# '#' at a line start plus its run of '#'s and the following whitespace, like
+# (?m)^#+\s+ but led by a literal so the scan can jump between '#'s
+_HEADER_RE = re.compile(r'#(?<![^\n]#)#*\s+')
+_BOLD_RE = re.compile(r'\*\*([^\*]+)\*\*')
+_ITALIC_RE = re.compile(r'\*([^\*]+)\*')
+_MD_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^\)]+)\)')
+_MD_LINK_START_RE = re.compile(r'\[([^\]]+)\]\(')
+_MD_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(([^\)]+)\)')
+_MD_IMAGE_ALT_RE = re.compile(r'!\[([^\]]+)\]')
+_MD_NAME_RES = [
+    re.compile(r'([A-Z][a-zA-Z\s]+(?:Court|House|Hall|Residence|Accommodation|Property))'),
+    re.compile(r'([A-Z][a-zA-Z\s]+\s+(?:Court|House|Hall|Residence))'),
+]
+_BREADCRUMB_URL_RE = re.compile(
+    r'(https?://[^\s\n\)"\'<>]+(?:property|accommodation|student|booking|universityliving|amberstudent)[^\s\n\)"\'<>]*)',
+    re.IGNORECASE
+)
+# Section headings, searched across the whole document (one line each)
+_MD_LOCATION_HEADING_RE = re.compile(r'^###?[^\S\n]+(?:location|address|city)', re.IGNORECASE | re.MULTILINE)
+_MD_PROVIDER_HEADING_RE = re.compile(r'^###?[^\S\n]+(?:provider|by)', re.IGNORECASE | re.MULTILINE)
+_MD_DESCRIPTION_HEADING_RE = re.compile(r'^###?[^\S\n]+(?:description|about|overview)', re.IGNORECASE | re.MULTILINE)
+
+# Candidate property URLs in markdown, as one tagged alternation. Each branch
+# sits in a lookahead so matches may overlap (a www. URL inside a plain URL
+# is still a candidate of its own); branches are line-bounded.
+_URL_CANDIDATE_RE = re.compile(
+    r'(?=(?P<href>href=["\'](?P<href_url>[^"\'\n]+)["\'])'   # HTML href
+    r'|(?P<md>\[[^\]\n]+\]\((?P<md_url>[^\)\n]+)\))'        # Markdown link
+    r'|(?P<plain>https?://[^\s\n\)"\'<>]+)'                 # Plain URL
+    r'|(?P<www>www\.[^\s\n\)"\'<>]+))'                      # www. URL
+)
+# Same pattern for ASCII bytes. In str patterns \s also covers the ASCII
+# separators \x1c-\x1f, which bytes \s does not, so they are added back
+_URL_CANDIDATE_BYTES_RE = re.compile(
+    _URL_CANDIDATE_RE.pattern.replace(r'[^\s\n', r'[^\s\x1c-\x1f\n').encode('ascii')
+)
+# Branch -> (pattern order, base priority, group holding the URL)
+_URL_CANDIDATE_KINDS = {
+    "href": (0, 3, "href_url"),                        # highest priority
+    "md": (1, 2, "md_url"),
+    "plain": (2, 1, "plain"),
+    "www": (3, 0, "www"),
+}
+_URL_SKIP_KEYWORDS = ['logo', 'icon', 'cdn', 'facebook', 'twitter', 'instagram', 'linkedin',
+                      'youtube', 'pinterest', 'svg', 'png', 'jpg', 'jpeg', 'webp', 'gif',
+                      'favicon', 'apple-touch', 'stylesheet', 'script', 'font', 'assets', 'files']
+_URL_PREFER_KEYWORDS = ['property', 'accommodation', 'student', 'booking', 'sterling', 'iq',
+                        'universityliving.com', 'amberstudent.com', 'unilodgers.com',
+                        'student.com', 'casita.com']
+
+
+def _any_substring_re(substrings) -> re.Pattern:
+    """One compiled alternation matching if any of substrings occurs"""
+    return re.compile('|'.join(map(re.escape, substrings)))
+
+
+# URL keyword checks: one regex scan each instead of a Python loop of `in` tests
+_URL_SKIP_RE = _any_substring_re(_URL_SKIP_KEYWORDS)
+_URL_PREFER_RE = _any_substring_re(_URL_PREFER_KEYWORDS)
+_URL_PAGE_PATH_RE = _any_substring_re(['/property', '/accommodation'])
+_URL_IMAGE_EXT_RE = _any_substring_re(['.svg', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico'])
+_URL_CDN_RE = _any_substring_re(['cdn', 'assets', 'files'])
+_URL_ASSET_RE = _any_substring_re(['svg', 'png', 'jpg', 'jpeg', 'gif', 'cdn', 'files'])
+_PAGE_IMAGE_EXT_RE = _any_substring_re(['.svg', '.png', '.jpg', '.jpeg', '.gif', '.webp'])
+
+
+# Recently parsed inputs -> PropertyData. Results are shared between callers,
+# who only read them (e.g. model_dump), so they are not copied.
+_PARSE_CACHE_SIZE = 128
+_parse_cache: "OrderedDict[Tuple, PropertyData]" = OrderedDict()
+
+
+def _cached_parse(key: Tuple, parse, *args) -> PropertyData:
+    """Return parse(*args), reusing the result for an input parsed recently"""
+    property_data = _parse_cache.get(key)
+    if property_data is not None:
+        _parse_cache.move_to_end(key)
+        return property_data
+    
+    property_data = parse(*args)
+    _parse_cache[key] = property_data
+    if len(_parse_cache) > _PARSE_CACHE_SIZE:
+        _parse_cache.popitem(last=False)
+    return property_data
+
+
+def _iter_lines(text: str, start: int = 0):
+    """Lazily yield the lines of text[start:], like text[start:].split('\\n')"""
+    while True:
+        end = text.find('\n', start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _next_lines(text: str, match: re.Match):
+    """Lazily yield the lines after the line containing match"""
+    end = text.find('\n', match.start())
+    return _iter_lines(text, end + 1) if end >= 0 else iter(())
+
+
+def _first(data: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """First truthy value among keys, or None"""
+    for key in keys:
+        value = data.get(key)
+        if value:
+            return value
+    return None
+
+
+def _truncate(text: str, limit: int = 200, suffix: str = "...") -> str:
+    """Cut text to limit characters, appending suffix if anything was cut"""
+    return text if len(text) <= limit else text[:limit] + suffix
+
+
+def _flatten_location(location_data: Dict[str, Any]) -> str:
+    """Format a location dict (address fields, label or coordinates) as one string"""
+    location_parts = [
+        str(part) for part in (_first(location_data, keys) for keys in _LOCATION_PART_KEYS) if part
+    ]
+    if location_parts:
+        return ", ".join(location_parts)
+    
+    label = _first(location_data, _LOCATION_LABEL_KEYS)
+    if label:
+        return str(label)
+    
+    # Last resort: use coordinates if available, else the dict itself
+    if location_data.get("lat") and location_data.get("lng"):
+        return f"{location_data['lat']}, {location_data['lng']}"
+    return str(location_data)
+
+
+def _score_url_candidate(potential_url: str, base_priority: int) -> Optional[Tuple[str, int]]:
+    """
+    Clean a URL found in markdown and score how likely it is the property page
+    
+    Returns:
+        (url, priority), or None if the URL is relative or obviously not a page
+    """
+    # Clean URL
+    potential_url = potential_url.strip('()[]"\'').split('?')[0].split('#')[0]
+    if not potential_url.startswith('http'):
+        if potential_url.startswith('www.'):
+            potential_url = 'https://' + potential_url
+        elif '://' not in potential_url:
+            return None  # Skip relative URLs
+    
+    # Skip obviously non-property URLs
+    url_lower = potential_url.lower()
+    if _URL_SKIP_RE.search(url_lower):
+        return None
+    
+    # Calculate priority score
+    priority = base_priority
+    if _URL_PREFER_RE.search(url_lower):
+        priority += 10
+    if _URL_PAGE_PATH_RE.search(url_lower):
+        priority += 5
+    if _URL_IMAGE_EXT_RE.search(url_lower):
+        priority -= 10  # Heavy penalty for image URLs
+    if _URL_CDN_RE.search(url_lower):
+        priority -= 8  # Penalty for CDN/assets
+    
+    return potential_url, priority
+
+
 def parse_json_to_property_data(data: Dict[str, Any]) -> PropertyData:
     """
     Parse JSON data to PropertyData, handling various JSON structures.
     Supports nested structures, API response formats, and field name variations.
+    
+    Identical payloads (same serialized JSON, key order included) reuse the
+    PropertyData parsed last time.
     """
+    try:
+        payload = orjson.dumps(data)
+    except TypeError:
+        # Non-string keys or types orjson can't encode - parse without caching
+        return _parse_json(data)
+    return _cached_parse(('json', payload), _parse_json, data)
+
+
+def _parse_json(data: Dict[str, Any]) -> PropertyData:
+    """Build PropertyData from a JSON payload (see parse_json_to_property_data)"""
     # Handle nested data structures (e.g., {"message": "success", "data": {...}})
     if "data" in data and isinstance(data["data"], dict):
         data = data["data"]
@@ -30,215 +268,172 @@ def parse_json_to_property_data(data: Dict[str, Any]) -> PropertyData:
     if isinstance(data, list) and len(data) > 0:
         data = data[0]
     
-    # Extract property name with various field name possibilities
-    property_name = (
-        data.get("property_name") or
-        data.get("name") or
-        data.get("title") or
-        data.get("property") or
-        data.get("propertyName") or
-        "Unknown Property"
-    )
-    
-    # Extract URL with various field name possibilities
-    url = (
-        data.get("url") or
-        data.get("source_link") or
-        data.get("link") or
-        data.get("property_url") or
-        data.get("website") or
-        data.get("sourceUrl") or
-        "https://example.com"
-    )
+    # Extract property name and URL with various field name possibilities
+    property_name = _first(data, _NAME_KEYS) or "Unknown Property"
+    url = _first(data, _URL_KEYS) or "https://example.com"
     
     # Extract location (handle both string and dict)
     location = None
-    location_data = (
-        data.get("location") or
-        data.get("address") or
-        data.get("city") or
-        data.get("area") or
-        data.get("address_line_1")
-    )
+    location_data = _first(data, _LOCATION_KEYS)
     
     if location_data:
         if isinstance(location_data, str):
             location = location_data
         elif isinstance(location_data, dict):
-            # If location is a dict, build a formatted address string
-            location_parts = []
-            
-            # Try common address fields in order of preference
-            if location_data.get("name"):
-                location_parts.append(str(location_data["name"]))
-            if location_data.get("address"):
-                location_parts.append(str(location_data["address"]))
-            if location_data.get("street"):
-                location_parts.append(str(location_data["street"]))
-            if location_data.get("city"):
-                location_parts.append(str(location_data["city"]))
-            if location_data.get("state") or location_data.get("region"):
-                location_parts.append(str(location_data.get("state") or location_data.get("region")))
-            if location_data.get("country"):
-                location_parts.append(str(location_data["country"]))
-            if location_data.get("postal_code") or location_data.get("zip_code"):
-                location_parts.append(str(location_data.get("postal_code") or location_data.get("zip_code")))
-            
-            # If we have parts, join them
-            if location_parts:
-                location = ", ".join(location_parts)
-            elif location_data.get("formatted_address"):
-                location = str(location_data["formatted_address"])
-            elif location_data.get("display_name"):
-                location = str(location_data["display_name"])
-            elif location_data.get("label"):
-                location = str(location_data["label"])
-            # Last resort: use coordinates if available
-            elif location_data.get("lat") and location_data.get("lng"):
-                location = f"{location_data['lat']}, {location_data['lng']}"
-            else:
-                # If nothing works, try to stringify the dict (but this shouldn't happen)
-                location = str(location_data)
+            location = _flatten_location(location_data)
         else:
             # For any other type, convert to string
-            location = str(location_data) if location_data else None
+            location = str(location_data)
     
     # Extract provider/source
-    provider = (
-        data.get("provider") or
-        data.get("source") or
-        data.get("host") or
-        data.get("owner_name") or
-        None
-    )
+    provider = _first(data, _PROVIDER_KEYS)
     
-    # Build text content from available fields
-    text_parts = []
+    # One pass over the payload: known fields are picked out for the sections
+    # below, other short strings are appended to the text at the end
+    fields = {}
+    extra_strings = []
+    for key, value in data.items():
+        if key in _EXCLUDED_TEXT_KEYS:
+            fields[key] = value
+        elif isinstance(value, str) and value and len(value) < 500:
+            extra_strings.append((key, value))
+    
+    # Build text content from available fields. Every piece is written with a
+    # leading newline (the separator), which is dropped at the end.
+    buf = io.StringIO()
+    write = buf.write
     
     # Add property name
     if property_name and property_name != "Unknown Property":
-        text_parts.append(f"Property: {property_name}")
+        write("\nProperty: ")
+        write(str(property_name))
     
     # Add location
     if location:
-        text_parts.append(f"Location: {location}")
+        write("\nLocation: ")
+        write(location)
     
     # Add description if available
-    if data.get("description"):
-        text_parts.append(f"\nDescription:\n{data['description']}")
+    if fields.get("description"):
+        write("\n\nDescription:\n")
+        write(str(fields["description"]))
     
     # Add about/overview
-    if data.get("about"):
-        text_parts.append(f"\nAbout:\n{data['about']}")
-    if data.get("overview"):
-        text_parts.append(f"\nOverview:\n{data['overview']}")
+    if fields.get("about"):
+        write("\n\nAbout:\n")
+        write(str(fields["about"]))
+    if fields.get("overview"):
+        write("\n\nOverview:\n")
+        write(str(fields["overview"]))
     
     # Add pricing information
-    if data.get("pricing"):
-        pricing = data["pricing"]
+    if fields.get("pricing"):
+        pricing = fields["pricing"]
         if isinstance(pricing, dict):
             currency = pricing.get("currency", "")
             duration = pricing.get("duration", "")
             min_price = pricing.get("min_price") or pricing.get("minPrice")
             max_price = pricing.get("max_price") or pricing.get("maxPrice")
             if min_price or max_price:
-                price_text = f"\nPricing:\n"
+                write("\n\nPricing:\n")
                 if min_price:
-                    price_text += f"From {currency} {min_price} {duration}\n"
+                    write(f"From {currency} {min_price} {duration}\n")
                 if max_price and max_price != min_price:
-                    price_text += f"To {currency} {max_price} {duration}\n"
-                text_parts.append(price_text)
+                    write(f"To {currency} {max_price} {duration}\n")
     
     # Add amenities/features
-    if data.get("amenities"):
-        amenities = data["amenities"]
+    if fields.get("amenities"):
+        amenities = fields["amenities"]
         if isinstance(amenities, list):
-            text_parts.append(f"\nAmenities:\n" + "\n".join(f"- {a}" if isinstance(a, str) else f"- {a.get('name', a)}" for a in amenities))
-    if data.get("features"):
-        features = data["features"]
+            write("\n\nAmenities:")
+            for a in amenities:
+                write(f"\n- {a}" if isinstance(a, str) else f"\n- {a.get('name', a)}")
+    if fields.get("features"):
+        features = fields["features"]
         if isinstance(features, list):
-            text_parts.append(f"\nFeatures:\n" + "\n".join(f"- {f}" if isinstance(f, str) else f"- {f.get('name', f)}" for f in features))
+            write("\n\nFeatures:")
+            for f in features:
+                write(f"\n- {f}" if isinstance(f, str) else f"\n- {f.get('name', f)}")
     
     # Add room types
-    if data.get("types"):
-        types = data["types"]
+    if fields.get("types"):
+        types = fields["types"]
         if isinstance(types, list):
-            text_parts.append(f"\nRoom Types:\n" + "\n".join(f"- {t}" for t in types))
-    if data.get("room_types"):
-        room_types = data["room_types"]
+            write("\n\nRoom Types:")
+            for t in types:
+                write(f"\n- {t}")
+    if fields.get("room_types"):
+        room_types = fields["room_types"]
         if isinstance(room_types, list):
-            text_parts.append(f"\nRoom Types:\n" + "\n".join(f"- {rt.get('name', rt) if isinstance(rt, dict) else rt}" for rt in room_types))
+            write("\n\nRoom Types:")
+            for rt in room_types:
+                write(f"\n- {rt.get('name', rt) if isinstance(rt, dict) else rt}")
     
     # Add meta/facts information
-    if data.get("meta") and isinstance(data["meta"], dict):
-        meta = data["meta"]
+    if fields.get("meta") and isinstance(fields["meta"], dict):
+        meta = fields["meta"]
         if meta.get("facts") and isinstance(meta["facts"], list):
-            text_parts.append("\nFacts:")
+            write("\n\nFacts:")
             for fact in meta["facts"]:
                 if isinstance(fact, dict):
-                    text_parts.append(f"- {fact.get('value', fact.get('name', fact))}")
+                    write(f"\n- {fact.get('value', fact.get('name', fact))}")
         
         # Add other meta fields
         if meta.get("floor"):
-            text_parts.append(f"\nFloor: {meta['floor']}")
+            write(f"\n\nFloor: {meta['floor']}")
         if meta.get("ranking"):
-            text_parts.append(f"Ranking: {meta['ranking']}")
+            write(f"\nRanking: {meta['ranking']}")
     
     # Add owner/contact information
-    if data.get("owner") and isinstance(data["owner"], dict):
-        owner = data["owner"]
+    if fields.get("owner") and isinstance(fields["owner"], dict):
+        owner = fields["owner"]
         if owner.get("emails"):
-            text_parts.append(f"\nContact Email: {', '.join(owner['emails'])}")
+            write(f"\n\nContact Email: {', '.join(owner['emails'])}")
         if owner.get("phones"):
-            text_parts.append(f"Contact Phone: {', '.join(owner['phones'])}")
+            write(f"\nContact Phone: {', '.join(owner['phones'])}")
     
     # Add policies/terms
-    if data.get("policies"):
-        policies = data["policies"]
+    if fields.get("policies"):
+        policies = fields["policies"]
         if isinstance(policies, list):
-            text_parts.append("\nPolicies:")
+            write("\n\nPolicies:")
             for policy in policies:
-                text_parts.append(f"- {policy if isinstance(policy, str) else policy.get('name', policy)}")
+                write(f"\n- {policy if isinstance(policy, str) else policy.get('name', policy)}")
     
     # Add all other string fields that might contain useful info
-    for key, value in data.items():
-        if key not in ["property_name", "name", "url", "source_link", "location", "address", 
-                       "provider", "source", "description", "about", "overview", "pricing",
-                       "amenities", "features", "types", "room_types", "meta", "owner", 
-                       "policies", "images", "links", "videos", "extracted_content"]:
-            if isinstance(value, str) and value and len(value) < 500:
-                text_parts.append(f"\n{key.replace('_', ' ').title()}: {value}")
+    for key, value in extra_strings:
+        write(f"\n\n{key.replace('_', ' ').title()}: {value}")
     
     # Combine all text
-    full_text = "\n".join(text_parts) if text_parts else json.dumps(data, indent=2)
+    full_text = buf.getvalue()[1:] or orjson.dumps(data, option=_JSON_FALLBACK_OPTIONS).decode()
     
-    # Extract images
+    # Extract images (only the ones kept are built)
     images = []
-    if data.get("images"):
-        img_list = data["images"] if isinstance(data["images"], list) else []
-        for img in img_list:
-            if isinstance(img, str):
-                images.append(ImageData(url=img))
-            elif isinstance(img, dict):
-                images.append(ImageData(
-                    url=img.get("url") or img.get("src") or img.get("image_url", ""),
-                    alt=img.get("alt") or img.get("title"),
-                    title=img.get("title")
-                ))
-    
-    # Extract links
+    if fields.get("images"):
+        img_list = fields["images"] if isinstance(fields["images"], list) else []
+        usable = (img for img in img_list if isinstance(img, (str, dict)))
+        images = [
+            ImageData(url=img) if isinstance(img, str) else ImageData(
+                url=img.get("url") or img.get("src") or img.get("image_url", ""),
+                alt=img.get("alt") or img.get("title"),
+                title=img.get("title")
+            )
+            for img in islice(usable, _MAX_IMAGES)
+        ]
+    
+    # Extract links (only the ones kept are built)
     links = []
-    if data.get("links"):
-        link_list = data["links"] if isinstance(data["links"], list) else []
-        for link in link_list:
-            if isinstance(link, str):
-                links.append(LinkData(url=link))
-            elif isinstance(link, dict):
-                links.append(LinkData(
-                    url=link.get("url") or link.get("href", ""),
-                    text=link.get("text") or link.get("title"),
-                    type=link.get("type")
-                ))
+    if fields.get("links"):
+        link_list = fields["links"] if isinstance(fields["links"], list) else []
+        usable = (link for link in link_list if isinstance(link, (str, dict)))
+        links = [
+            LinkData(url=link) if isinstance(link, str) else LinkData(
+                url=link.get("url") or link.get("href", ""),
+                text=link.get("text") or link.get("title"),
+                type=link.get("type")
+            )
+            for link in islice(usable, _MAX_LINKS)
+        ]
     
     # Extract meta tags
     meta_tags = None
@@ -247,7 +442,7 @@ def parse_json_to_property_data(data: Dict[str, Any]) -> PropertyData:
         if isinstance(meta_data, dict):
             meta_tags = MetaData(
                 title=meta_data.get("title") or property_name,
-                description=meta_data.get("description") or (full_text[:200] + "..." if len(full_text) > 200 else full_text),
+                description=meta_data.get("description") or _truncate(full_text),
                 keywords=meta_data.get("keywords") if isinstance(meta_data.get("keywords"), list) else None,
                 og_tags=meta_data.get("og_tags") if isinstance(meta_data.get("og_tags"), dict) else None
             )
@@ -255,30 +450,23 @@ def parse_json_to_property_data(data: Dict[str, Any]) -> PropertyData:
     # Create ExtractedContent
     extracted_content = ExtractedContent(
         text=full_text,
-        images=images[:20],
-        links=links[:50],
+        images=images,
+        links=links,
         meta_tags=meta_tags or MetaData(
             title=property_name,
-            description=full_text[:200] + "..." if len(full_text) > 200 else full_text
+            description=_truncate(full_text)
         )
     )
     
-    # Final safety check: ensure location is a string (not dict or other type)
-    if location is not None and not isinstance(location, str):
-        if isinstance(location, dict):
-            # Convert dict to string (shouldn't happen if above logic worked, but safety check)
-            location_parts = []
-            if location.get("name"):
-                location_parts.append(str(location["name"]))
-            if location.get("address"):
-                location_parts.append(str(location["address"]))
-            if location.get("city"):
-                location_parts.append(str(location["city"]))
-            if location.get("country"):
-                location_parts.append(str(location["country"]))
-            location = ", ".join(location_parts) if location_parts else None
-        else:
-            location = str(location) if location else None
+    # Remaining keys become additional_metadata, in payload order. Validation
+    # copies the dict, so without excluded keys the payload is passed as is.
+    if _EXCLUDED_METADATA_KEYS.isdisjoint(data):
+        additional_metadata = data
+    else:
+        additional_metadata = {
+            k: v for k, v in data.items()
+            if k not in _EXCLUDED_METADATA_KEYS
+        }
     
     # Build PropertyData
     property_data = PropertyData(
@@ -287,111 +475,113 @@ def parse_json_to_property_data(data: Dict[str, Any]) -> PropertyData:
         url=url,
         location=location,  # Guaranteed to be str or None
         extracted_content=extracted_content,
-        additional_metadata={
-            k: v for k, v in data.items() 
-            if k not in ["property_name", "name", "url", "source_link", "location", 
-                        "provider", "source", "extracted_content"]
-        }
+        additional_metadata=additional_metadata
     )
     
     return property_data
 
 
-def parse_text_to_property_data(text: str, default_url: str = "https://example.com") -> PropertyData:
-    """
-    Parse plain text into PropertyData structure.
-    VERY PERMISSIVE - accepts any text and extracts what it can.
+def _text_property_name(lines) -> str:
     """
-    lines = text.split('\n')
+    Find the property name in the first lines of plain text
     
-    # Extract property name (try multiple strategies)
-    property_name = "Unknown Property"
+    Strategies, in order of preference:
+    1. Explicit patterns like "Property Name: X" (first 20 lines)
+    2. First non-empty line that doesn't look like a URL or label (first 5 lines)
+    3. Property-like names, e.g. "X Court" or "X Residence" (first 30 lines)
     
-    # Strategy 1: Look for explicit patterns
-    for line in lines[:20]:  # Check first 20 lines
-        # Look for patterns like "Property Name: X" or "Name: X"
-        match = re.search(r'(?:property\s*name|name|title)[\s:]+([^\n]+)', line, re.IGNORECASE)
-        if match:
-            name_candidate = match.group(1).strip()
-            if len(name_candidate) > 3 and len(name_candidate) < 100:
-                property_name = name_candidate
-                break
+    All three run in a single pass, which stops once no better match can follow.
+    """
+    explicit_search = True
+    first_line = None
+    titlecase_name = None
     
-    # Strategy 2: Use first non-empty line if still unknown
-    if property_name == "Unknown Property":
-        for line in lines[:5]:
+    for i, line in enumerate(islice(lines, 30)):
+        if i < 20:
+            match = _NAME_EXPLICIT_RE.search(line) if explicit_search else None
+            if match:
+                name_candidate = match.group(1).strip()
+                if len(name_candidate) > 3 and len(name_candidate) < 100:
+                    if name_candidate != "Unknown Property":
+                        return name_candidate
+                    # A literal "Unknown Property" ends this strategy
+                    explicit_search = False
+        elif (first_line and first_line != "Unknown Property") or titlecase_name:
+            break
+        
+        if i < 5 and first_line is None:
             clean_line = line.strip()
             if clean_line and len(clean_line) > 3 and len(clean_line) < 100:
                 # Skip lines that look like URLs, dates, or generic words
                 if not clean_line.startswith(('http', 'www', 'Location', 'URL', 'Description')):
-                    property_name = clean_line
-                    break
-    
-    # Strategy 3: Try to find property names from common patterns
-    if property_name == "Unknown Property":
-        # Look for property-like names (capitals, specific words)
-        for line in lines[:30]:
-            match = re.search(r'([A-Z][a-zA-Z\s&]+(?:Court|House|Hall|Residence|Accommodation|Property|Living|Student|Apartments?))', line)
+                    first_line = clean_line
+        
+        if titlecase_name is None:
+            match = _NAME_TITLECASE_RE.search(line)
             if match:
-                property_name = match.group(1).strip()
-                break
+                titlecase_name = match.group(1).strip()
+    
+    if first_line and first_line != "Unknown Property":
+        return first_line
+    return titlecase_name or "Unknown Property"
+
+
+def parse_text_to_property_data(text: str, default_url: str = "https://example.com") -> PropertyData:
+    """
+    Parse plain text into PropertyData structure.
+    VERY PERMISSIVE - accepts any text and extracts what it can.
+    """
+    lines = text.split('\n')
+    
+    # Extract property name (try multiple strategies)
+    property_name = _text_property_name(lines)
     
     # Extract URL
     url = default_url
-    url_pattern = r'https?://[^\s\n]+|www\.[^\s\n]+'
-    for line in lines:
-        match = re.search(url_pattern, line, re.IGNORECASE)
-        if match:
-            url = match.group(0)
-            if not url.startswith('http'):
-                url = 'https://' + url
-            break
+    match = _TEXT_URL_RE.search(text)
+    if match:
+        url = match.group(0)
+        if not url.startswith('http'):
+            url = 'https://' + url
     
     # Extract location
     location = None
-    for line in lines:
-        match = re.search(r'(?:location|address|city)[\s:]+([^\n]+)', line, re.IGNORECASE)
-        if match:
-            location = match.group(1).strip()
-            break
+    match = _TEXT_LOCATION_RE.search(text)
+    if match:
+        location = match.group(1).strip()
     
     # Extract provider if mentioned
     provider = None
-    for line in lines:
-        match = re.search(r'(?:provider|by|hosted by)[\s:]+([^\n]+)', line, re.IGNORECASE)
-        if match:
-            provider = match.group(1).strip()
-            break
+    match = _TEXT_PROVIDER_RE.search(text)
+    if match:
+        provider = match.group(1).strip()
     
     # Clean up text (remove empty lines, normalize whitespace)
-    clean_text = '\n'.join(line.strip() for line in lines if line.strip())
+    clean_text = '\n'.join([stripped for stripped in map(str.strip, lines) if stripped])
     
     # Extract images (look for image URLs or image references)
-    images = []
-    image_pattern = r'(?:image|photo|img)[\s:]+([^\s\n]+\.(?:jpg|jpeg|png|gif|webp))'
-    for match in re.finditer(image_pattern, clean_text, re.IGNORECASE):
-        images.append(ImageData(url=match.group(1)))
+    images = [
+        ImageData.model_construct(url=match.group(1))
+        for match in islice(_TEXT_IMAGE_RE.finditer(clean_text), _MAX_IMAGES)
+    ]
     
-    # Extract links (look for URLs)
-    links = []
-    link_pattern = r'(https?://[^\s\n\)]+)'
-    for match in re.finditer(link_pattern, clean_text):
-        url_found = match.group(0)
-        if url_found != url:  # Don't include the main property URL
-            links.append(LinkData(url=url_found))
+    # Extract links (look for URLs), skipping the main property URL
+    other_urls = (match.group(0) for match in _TEXT_LINK_RE.finditer(clean_text) if match.group(0) != url)
+    links = [LinkData.model_construct(url=url_found) for url_found in islice(other_urls, _MAX_LINKS)]
     
-    # Create ExtractedContent
-    extracted_content = ExtractedContent(
+    # Create ExtractedContent. Every value is a str (or None) produced above,
+    # so the models are built without re-running pydantic validation.
+    extracted_content = ExtractedContent.model_construct(
         text=clean_text,
-        images=images[:20],  # Limit to 20 images
-        links=links[:50],    # Limit to 50 links
-        meta_tags=MetaData(
+        images=images,
+        links=links,
+        meta_tags=MetaData.model_construct(
             title=f"{property_name} | Property Details",
-            description=clean_text[:200] + "..." if len(clean_text) > 200 else clean_text
+            description=_truncate(clean_text)
         )
     )
     
-    return PropertyData(
+    return PropertyData.model_construct(
         property_name=property_name,
         provider=provider,
         url=url,
@@ -406,34 +596,32 @@ def parse_markdown_to_property_data(markdown: str, default_url: str = "https://e
     Extracts headings, links, images, and structured content.
     Handles HTML content, Markdown syntax, and mixed formats.
     """
-    lines = markdown.split('\n')
-    
     # Extract property name from first H1 or H2, or from bold text, or from image alt text
     property_name = "Unknown Property"
     
     # Try H1 first
-    for line in lines[:50]:
-        h1_match = re.match(r'^#\s+(.+?)(?:\s*\{|$)', line)
+    for line in islice(_iter_lines(markdown), 50):
+        h1_match = _H1_RE.match(line)
         if h1_match:
             property_name = h1_match.group(1).strip()
             # Clean up any markdown formatting
-            property_name = re.sub(r'\*\*([^*]+)\*\*', r'\1', property_name)
-            property_name = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', property_name)
+            property_name = _BOLD_RE.sub(r'\1', property_name)
+            property_name = _MD_LINK_RE.sub(r'\1', property_name)
             break
     
     # If not found, try H2
     if property_name == "Unknown Property":
-        for line in lines[:50]:
-            h2_match = re.match(r'^##\s+(.+?)(?:\s*\{|$)', line)
+        for line in islice(_iter_lines(markdown), 50):
+            h2_match = _H2_RE.match(line)
             if h2_match:
                 property_name = h2_match.group(1).strip()
-                property_name = re.sub(r'\*\*([^*]+)\*\*', r'\1', property_name)
-                property_name = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', property_name)
+                property_name = _BOLD_RE.sub(r'\1', property_name)
+                property_name = _MD_LINK_RE.sub(r'\1', property_name)
                 break
     
     # If still not found, try to find from image alt text (common in scraped content)
     if property_name == "Unknown Property":
-        img_alt_match = re.search(r'!\[([^\]]+)\]', markdown)
+        img_alt_match = _MD_IMAGE_ALT_RE.search(markdown)
         if img_alt_match:
             alt_text = img_alt_match.group(1).strip()
             # Use alt text if it looks like a property name
@@ -443,159 +631,136 @@ def parse_markdown_to_property_data(markdown: str, default_url: str = "https://e
     # Try to find property name from common patterns
     if property_name == "Unknown Property":
         # Look for patterns like "iQ Sterling Court" or similar
-        name_patterns = [
-            r'([A-Z][a-zA-Z\s]+(?:Court|House|Hall|Residence|Accommodation|Property))',
-            r'([A-Z][a-zA-Z\s]+\s+(?:Court|House|Hall|Residence))',
-        ]
-        for pattern in name_patterns:
-            match = re.search(pattern, markdown[:1000])
+        for pattern in _MD_NAME_RES:
+            match = pattern.search(markdown[:1000])
             if match:
                 property_name = match.group(1).strip()
                 break
     
     # Extract URL from markdown links, HTML links, or plain URLs
     url = default_url
-    url_candidates = []
-    
-    # First pass: collect all URLs with priority scores
-    url_patterns = [
-        (r'href=["\']([^"\']+)["\']', 3),              # HTML href (highest priority)
-        (r'\[([^\]]+)\]\(([^\)]+)\)', 2),              # Markdown link
-        (r'https?://[^\s\n\)"\'<>]+', 1),              # Plain URL
-        (r'www\.[^\s\n\)"\'<>]+', 0),                  # www. URL
-    ]
     
-    skip_keywords = ['logo', 'icon', 'cdn', 'facebook', 'twitter', 'instagram', 'linkedin', 
-                     'youtube', 'pinterest', 'svg', 'png', 'jpg', 'jpeg', 'webp', 'gif',
-                     'favicon', 'apple-touch', 'stylesheet', 'script', 'font', 'assets', 'files']
-    
-    prefer_keywords = ['property', 'accommodation', 'student', 'booking', 'sterling', 'iq',
-                       'universityliving.com', 'amberstudent.com', 'unilodgers.com', 
-                       'student.com', 'casita.com']
-    
-    for line in lines:
-        for pattern, base_priority in url_patterns:
-            matches = re.finditer(pattern, line)
-            for match in matches:
-                if match.lastindex:
-                    potential_url = match.group(match.lastindex)
-                else:
-                    potential_url = match.group(0)
-                
-                # Clean URL
-                potential_url = potential_url.strip('()[]"\'').split('?')[0].split('#')[0]
-                if not potential_url.startswith('http'):
-                    if potential_url.startswith('www.'):
-                        potential_url = 'https://' + potential_url
-                    elif '://' not in potential_url:
-                        continue  # Skip relative URLs
-                
-                # Skip obviously non-property URLs
-                url_lower = potential_url.lower()
-                if any(skip in url_lower for skip in skip_keywords):
-                    continue
-                
-                # Calculate priority score
-                priority = base_priority
-                if any(pref in url_lower for pref in prefer_keywords):
-                    priority += 10
-                if '/property' in url_lower or '/accommodation' in url_lower:
-                    priority += 5
-                if any(ext in url_lower for ext in ['.svg', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico']):
-                    priority -= 10  # Heavy penalty for image URLs
-                if 'cdn' in url_lower or 'assets' in url_lower or 'files' in url_lower:
-                    priority -= 8  # Penalty for CDN/assets
-                
-                url_candidates.append((potential_url, priority))
-    
-    # Sort by priority and take the best one
-    if url_candidates:
-        url_candidates.sort(key=lambda x: x[1], reverse=True)
-        url = url_candidates[0][0]
+    # Collect all URLs with priority scores in a single scan. Matches of the
+    # same kind never overlap, as if each pattern were scanned on its own.
+    # ASCII pages (the usual case) are scanned as bytes, which is faster; the
+    # bytes pattern adds \x1c-\x1f to \s so it matches what the str one would
+    scan_bytes = markdown.isascii()
+    if scan_bytes:
+        candidates = _URL_CANDIDATE_BYTES_RE.finditer(markdown.encode('ascii'))
+    else:
+        candidates = _URL_CANDIDATE_RE.finditer(markdown)
+    
+    kind_ends = [0, 0, 0, 0]
+    best_key = None
+    line_number = 0
+    line_start = 0
+    
+    for match in candidates:
+        kind = match.lastgroup
+        pattern_index, base_priority, url_group = _URL_CANDIDATE_KINDS[kind]
+        start = match.start()
+        if start < kind_ends[pattern_index]:
+            continue
+        kind_ends[pattern_index] = match.end(kind)
+        
+        potential_url = match.group(url_group)
+        if scan_bytes:
+            potential_url = potential_url.decode('ascii')
+        candidate = _score_url_candidate(potential_url, base_priority)
+        if candidate is None:
+            continue
+        
+        # Highest priority wins; ties go to the earliest line, then pattern order
+        potential_url, priority = candidate
+        line_number += markdown.count('\n', line_start, start)
+        line_start = start
+        key = (-priority, line_number, pattern_index)
+        if best_key is None or key < best_key:
+            best_key = key
+            url = potential_url
     
     # Fallback: try to find any property-related URL in the main domain
-    if url == default_url or any(skip in url.lower() for skip in ['svg', 'png', 'jpg', 'jpeg', 'gif', 'cdn', 'files']):
-        for line in lines[:200]:
+    if url == default_url or _URL_ASSET_RE.search(url.lower()):
+        for line in islice(_iter_lines(markdown), 200):
             # Look for URLs in breadcrumbs or navigation that are actual pages
-            breadcrumb_match = re.search(r'(https?://[^\s\n\)"\'<>]+(?:property|accommodation|student|booking|universityliving|amberstudent)[^\s\n\)"\'<>]*)', line, re.IGNORECASE)
+            breadcrumb_match = _BREADCRUMB_URL_RE.search(line)
             if breadcrumb_match:
                 candidate = breadcrumb_match.group(1)
-                if not any(ext in candidate.lower() for ext in ['.svg', '.png', '.jpg', '.jpeg', '.gif', '.webp']):
+                if not _PAGE_IMAGE_EXT_RE.search(candidate.lower()):
                     url = candidate
                     break
     
     # Extract location from markdown structure
     location = None
-    for i, line in enumerate(lines):
-        if re.search(r'^###?\s+(?:location|address|city)', line, re.IGNORECASE):
-            if i + 1 < len(lines):
-                location = lines[i + 1].strip()
-                break
+    match = _MD_LOCATION_HEADING_RE.search(markdown)
+    if match:
+        for line in _next_lines(markdown, match):
+            location = line.strip()
+            break
     
     # Extract provider
     provider = None
-    for i, line in enumerate(lines):
-        if re.search(r'^###?\s+(?:provider|by)', line, re.IGNORECASE):
-            if i + 1 < len(lines):
-                provider = lines[i + 1].strip()
-                break
+    match = _MD_PROVIDER_HEADING_RE.search(markdown)
+    if match:
+        for line in _next_lines(markdown, match):
+            provider = line.strip()
+            break
     
     # Extract images from markdown
-    images = []
-    image_pattern = r'!\[([^\]]*)\]\(([^\)]+)\)'
-    for match in re.finditer(image_pattern, markdown):
-        alt_text = match.group(1)
-        image_url = match.group(2)
-        images.append(ImageData(url=image_url, alt=alt_text if alt_text else None))
+    images = [
+        ImageData.model_construct(url=match.group(2), alt=match.group(1) or None)
+        for match in islice(_MD_IMAGE_RE.finditer(markdown), _MAX_IMAGES)
+    ]
     
-    # Extract links from markdown
-    links = []
-    link_pattern = r'\[([^\]]+)\]\(([^\)]+)\)'
-    for match in re.finditer(link_pattern, markdown):
-        link_text = match.group(1)
-        link_url = match.group(2)
-        if not link_url.startswith('#'):  # Skip anchor links
-            links.append(LinkData(url=link_url, text=link_text))
+    # Extract links from markdown, skipping anchor links
+    page_links = (match for match in _MD_LINK_RE.finditer(markdown) if not match.group(2).startswith('#'))
+    links = [
+        LinkData.model_construct(url=match.group(2), text=match.group(1))
+        for match in islice(page_links, _MAX_LINKS)
+    ]
     
     # Extract meta information
     title = property_name
     description = None
     
     # Look for description section
-    for i, line in enumerate(lines):
-        if re.search(r'^###?\s+(?:description|about|overview)', line, re.IGNORECASE):
-            desc_lines = []
-            for j in range(i + 1, min(i + 5, len(lines))):
-                if lines[j].strip() and not lines[j].startswith('#'):
-                    desc_lines.append(lines[j].strip())
-            if desc_lines:
-                description = ' '.join(desc_lines)
-            break
+    match = _MD_DESCRIPTION_HEADING_RE.search(markdown)
+    if match:
+        desc_lines = []
+        for line in islice(_next_lines(markdown, match), 4):
+            if line.strip() and not line.startswith('#'):
+                desc_lines.append(line.strip())
+        if desc_lines:
+            description = ' '.join(desc_lines)
     
     # Clean markdown text (remove markdown syntax for plain text version)
     clean_text = markdown
     # Remove image syntax
-    clean_text = re.sub(r'!\[([^\]]*)\]\([^\)]+\)', r'\1', clean_text)
+    clean_text = _MD_IMAGE_RE.sub(r'\1', clean_text)
     # Remove link syntax, keep text
-    clean_text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', clean_text)
+    clean_text = _MD_LINK_RE.sub(r'\1', clean_text)
     # Remove headers
-    clean_text = re.sub(r'^#+\s+', '', clean_text, flags=re.MULTILINE)
-    # Remove bold/italic
-    clean_text = re.sub(r'\*\*([^\*]+)\*\*', r'\1', clean_text)
-    clean_text = re.sub(r'\*([^\*]+)\*', r'\1', clean_text)
-    
-    # Create ExtractedContent
-    extracted_content = ExtractedContent(
+    clean_text = _HEADER_RE.sub('', clean_text)
+    # Remove bold/italic. Only paired asterisks go (a lone '*' as in "5 * 3"
+    # stays), so this can't be a plain replace('*', ''); pages without any
+    # '*' skip both passes.
+    if '*' in clean_text:
+        clean_text = _BOLD_RE.sub(r'\1', clean_text)
+        clean_text = _ITALIC_RE.sub(r'\1', clean_text)
+    
+    # Create ExtractedContent. Every value is a str (or None) produced above,
+    # so the models are built without re-running pydantic validation.
+    extracted_content = ExtractedContent.model_construct(
         text=clean_text,
-        images=images[:20],
-        links=links[:50],
-        meta_tags=MetaData(
+        images=images,
+        links=links,
+        meta_tags=MetaData.model_construct(
             title=title,
-            description=description or (clean_text[:200] + "..." if len(clean_text) > 200 else clean_text)
+            description=description or _truncate(clean_text)
         )
     )
     
-    return PropertyData(
+    return PropertyData.model_construct(
         property_name=property_name,
         provider=provider,
         url=url,
@@ -628,40 +793,48 @@ def parse_input_to_property_data(
     if isinstance(data, dict):
         return parse_json_to_property_data(data)
     
-    # If string, parse based on format
+    # If string, parse based on format (repeated strings reuse the last result)
     if isinstance(data, str):
         text = data.strip()
-        
-        # Auto-detect format if needed
-        if input_format == 'auto':
-            # Try JSON first
-            if text.startswith('{') or text.startswith('['):
-                try:
-                    json_data = json.loads(text)
-                    return parse_json_to_property_data(json_data)
-                except json.JSONDecodeError as e:
-                    # If JSON parsing fails, try to handle partial JSON
-                    # Look for JSON-like structure even if not perfect
-                    pass
-            
-            # Check for markdown patterns
-            if re.search(r'^#+\s+', text, re.MULTILINE) or re.search(r'\[([^\]]+)\]\(', text):
-                return parse_markdown_to_property_data(text, default_url)
-            
-            # Default to text
-            return parse_text_to_property_data(text, default_url)
-        
-        # Explicit format specified
-        if input_format == 'json':
+        return _cached_parse(
+            ('str', text, input_format, default_url),
+            _parse_string, text, input_format, default_url
+        )
+    
+    raise ValueError(f"Unsupported input type: {type(data)}")
+
+
+def _parse_string(text: str, input_format: str, default_url: str) -> PropertyData:
+    """Parse stripped JSON/text/markdown input (see parse_input_to_property_data)"""
+    # Auto-detect format if needed
+    if input_format == 'auto':
+        # Try JSON first
+        if text.startswith(('{', '[')):
             try:
-                json_data = json.loads(text)
+                json_data = orjson.loads(text)
                 return parse_json_to_property_data(json_data)
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON format: {str(e)}")
-        elif input_format == 'markdown':
+            except orjson.JSONDecodeError as e:
+                # If JSON parsing fails, try to handle partial JSON
+                # Look for JSON-like structure even if not perfect
+                pass
+        
+        # Check for markdown patterns (substring checks rule out most plain
+        # text before any regex scan)
+        if ('#' in text and _HEADER_RE.search(text)) or ('](' in text and _MD_LINK_START_RE.search(text)):
             return parse_markdown_to_property_data(text, default_url)
-        else:  # text
-            return parse_text_to_property_data(text, default_url)
-    
-    raise ValueError(f"Unsupported input type: {type(data)}")
+        
+        # Default to text
+        return parse_text_to_property_data(text, default_url)
+    
+    # Explicit format specified
+    if input_format == 'json':
+        try:
+            json_data = orjson.loads(text)
+            return parse_json_to_property_data(json_data)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON format: {str(e)}")
+    elif input_format == 'markdown':
+        return parse_markdown_to_property_data(text, default_url)
+    else:  # text
+        return parse_text_to_property_data(text, default_url)
 
@@ -0,0 +1,21 @@
+"""
+ARQ worker entry point
+
+    cd ui && arq backend.worker.WorkerSettings
+
+The worker only makes sense with Redis, so importing this module fails right
+away when REDIS_URL is not set, instead of the worker retrying a connection to
+localhost:6379 until the platform restarts it.
+"""
+
+import os
+
+if not os.getenv("REDIS_URL"):
+    raise RuntimeError(
+        "REDIS_URL is not set - the ARQ worker needs Redis. Without Redis the API "
+        "runs jobs itself; only run the worker process when REDIS_URL is configured."
+    )
+
+from .tasks import WorkerSettings
+
+__all__ = ["WorkerSettings"]
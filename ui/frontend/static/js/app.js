@@ -718,8 +718,8 @@ async function showResults(jobId) {
         document.getElementById('statTime').textContent = 
             `${summary.processing_time_seconds.toFixed(0)}s`;
         
-        // Show HTML report preview inline
-        if (data.html_report) {
+        // Show HTML report preview inline (loaded by the browser from /outputs)
+        if (data.html_url || data.html_report) {
             // Create an iframe to display the HTML report safely
             const previewContent = document.getElementById('previewContent');
             previewContent.innerHTML = '';
@@ -732,11 +732,16 @@ async function showResults(jobId) {
             iframe.style.border = 'none';
             iframe.style.borderRadius = '8px';
             iframe.style.boxShadow = '0 2px 8px rgba(0,0,0,0.1)';
-            iframe.srcdoc = data.html_report;
+            if (data.html_url) {
+                iframe.src = data.html_url;
+            } else {
+                iframe.srcdoc = data.html_report;
+            }
             previewContent.appendChild(iframe);
         } else {
             // Fallback to markdown preview if HTML not available
-            const preview = data.markdown_report.split('\n').slice(0, 30).join('\n');
+            const markdown = data.markdown_url ? await (await fetch(data.markdown_url)).text() : '';
+            const preview = markdown.split('\n').slice(0, 30).join('\n');
             document.getElementById('previewContent').innerHTML = 
                 `<pre style="white-space: pre-wrap; font-family: monospace; font-size: 0.9rem;">${escapeHtml(preview)}\n\n... (generating HTML report)</pre>`;
         }
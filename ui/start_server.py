@@ -3,8 +3,15 @@
 Start the Property Comparison Tool UI Server
 
 This script starts the FastAPI backend server which serves the UI.
+
+Usage:
+    python start_server.py              # production settings
+    python start_server.py --reload     # development, auto-reload on code changes
+    python start_server.py --workers 4  # several workers (needs REDIS_URL)
 """
 
+import argparse
+import os
 import sys
 import uvicorn
 from pathlib import Path
@@ -12,27 +19,53 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+
+def parse_args() -> argparse.Namespace:
+    """Command line options (workers default to WEB_CONCURRENCY, like the Procfile)"""
+    # Several workers need the shared Redis job store (REDIS_URL); with the
+    # in-memory store each worker would only see its own jobs.
+    default_workers = int(os.getenv("WEB_CONCURRENCY", "4" if os.getenv("REDIS_URL") else "1"))
+    
+    parser = argparse.ArgumentParser(description="Start the Property Comparison Tool UI server")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to bind (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    parser.add_argument("--workers", type=int, default=default_workers,
+                        help=f"Worker processes (default: {default_workers})")
+    parser.add_argument("--reload", action="store_true",
+                        help="Auto-reload on code changes (development only, single worker)")
+    return parser.parse_args()
+
+
 def main():
     """Start the server"""
+    args = parse_args()
+    
     print("\n" + "=" * 70)
     print("🏠 Property Comparison Tool - Web UI")
     print("=" * 70)
     print("\n📡 Starting server...")
-    print("\n🌐 Access the UI at: http://localhost:8000")
-    print("📚 API docs at: http://localhost:8000/docs")
+    print(f"\n🌐 Access the UI at: http://localhost:{args.port}")
+    print(f"📚 API docs at: http://localhost:{args.port}/docs")
+    if args.reload:
+        print("🔄 Auto-reload enabled (development mode)")
+    else:
+        print(f"⚙️  Workers: {args.workers}")
     print("\n⚠️  Press CTRL+C to stop the server\n")
     print("=" * 70 + "\n")
     
-    # Start uvicorn server
+    # Start uvicorn server. "auto" picks uvloop and httptools when installed
+    # (uvicorn[standard]) and falls back to asyncio/h11 otherwise.
     uvicorn.run(
         "backend.app:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=args.host,
+        port=args.port,
+        loop="auto",
+        http="auto",
+        # Auto-reload only works with a single worker
+        workers=1 if args.reload else args.workers,
+        reload=args.reload,
         log_level="info"
     )
 
 if __name__ == "__main__":
     main()
-
-